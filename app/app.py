@@ -1,27 +1,43 @@
+import importlib
+
 import streamlit as st
 import pandas as pd
 from pathlib import Path
 
+from column_profile import build_column_profile
+from cube import CUBE_FILTER_COLUMNS, build_cube, slice_cube
+from data_store import (FLOAT32, PROBS_COLUMNS, PROBS_NAME, PROCESSED_NAME, attach_probabilities, dataset_version,
+                        freeze_frame, read_table)
+from fig_cache import filter_fingerprint
+from filter_index import active_filters, build_filter_index, resolve_filters
+from perf import finish_rerun, render_memory_report, render_overlay, stage, start_rerun
+from schema import column_memory, compact_dtypes, decode_frame
+
 st.set_page_config( #ana sayfa bilgileri
     page_title="Telco Churn Analytics Dashboard", 
     layout="wide", 
     initial_sidebar_state="expanded"
 )
-#chartları burda importluyoruz, exceptionları henüz bazı chartlar oluşmamışken kullandık
-try:
-    from charts_mehmet import render_x_charts
-except ImportError:
-    render_x_charts = None
-
-try:
-    from charts_arsen import render_y_charts 
-except ImportError:
-    render_y_charts = None
-
-try:
-    from charts_isil import render_z_charts 
-except ImportError:
-    render_z_charts = None
+# paylaşılan veri setinden türeyen alt kümeler ve sığ kopyalar, değiştirilene kadar aynı bufferları kullanıyor
+pd.set_option("mode.copy_on_write", True)
+start_rerun() #bu rerun'ın aşama sürelerini sıfırdan topluyoruz (bkz. perf.py)
+# chart modülleri (plotly, sklearn...) açılışta değil, sekmeleri ilk seçildiğinde import ediliyor (bkz. load_renderer)
+CHART_MODULES = {
+    "x": ("charts_mehmet", "render_x_charts"),
+    "y": ("charts_arsen", "render_y_charts"),
+    "z": ("charts_isil", "render_z_charts"),
+    "whatif": ("whatif", "render_whatif_panel"),
+}
+
+def load_renderer(name): #modül bir kez import ediliyor, sonrası sys.modules'tan geliyor
+    module_name, function_name = CHART_MODULES[name]
+    try:
+        with stage(f"import.{module_name}"):
+            return getattr(importlib.import_module(module_name), function_name)
+    except ImportError as e:
+        # hata gizlenmesin: eksik paket/modül adıyla gösteriyoruz
+        st.error(f"Could not load {module_name}: {e}")
+        return None
 
 def load_css(file_name="styles.css"): #css dosyasını yüklüyoruz
     css_path = Path(__file__).parent / file_name
@@ -31,92 +47,61 @@ def load_css(file_name="styles.css"): #css dosyasını yüklüyoruz
 
 load_css()
 
-@st.cache_data
-def load_data(): #3 çeşit data dosyamız var raw olanın yanında, proccessed ve probs. Genelde processedi kullanıcaz
-    current_dir = Path(__file__).parent
-    data_dir = current_dir.parent / "data" / "processed"
-    
-    clean_data_path = data_dir / "Telco_processed.csv"    
-            
-    probs_path = data_dir / "telco_churn_with_probs.csv"
+# cache_data her çağrıda pickle'dan yeni bir kopya veriyordu; cache_resource ile process başına tek,
+# salt okunur bir frame var ve tüm oturumlar onu paylaşıyor (max_entries=1: eski versiyon bırakılıyor)
+@st.cache_resource(max_entries=1)
+def load_data(version, float32=False): #3 çeşit data dosyamız var raw olanın yanında, proccessed ve probs. Genelde processedi kullanıcaz
+    # parquet varsa onu, yoksa csv'yi okuyoruz (bkz. data_store.read_table)
+    df_clean = read_table(PROCESSED_NAME)
     
-    if clean_data_path:
-        df_clean = pd.read_csv(clean_data_path)
-        
-        # --- MAPPING İŞLEMLERİ ---
-        
-        # 1. Binary (0/1 -> No/Yes)
-        binary_cols = ["Partner", "Dependents", "PhoneService", "PaperlessBilling", "SeniorCitizen"]
-        for col in binary_cols:
-            if col in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean[col]):
-                df_clean[col] = df_clean[col].map({0: "No", 1: "Yes"}).fillna(df_clean[col])
-
-        # 2. Cinsiyet
-        if "gender" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean["gender"]):
-             df_clean["gender"] = df_clean["gender"].map({0: "Female", 1: "Male"}).fillna(df_clean["gender"])
-
-        # 3. Çoklu Servisler
-        multi_cols = [
-            "OnlineSecurity", "DeviceProtection", "TechSupport", 
-            "StreamingTV", "StreamingMovies", "OnlineBackup" 
-        ]
-        for col in multi_cols:
-             if col in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean[col]):
-                mapping = {0: "No", 1: "No internet service", 2: "Yes"}
-                df_clean[col] = df_clean[col].map(mapping).fillna(df_clean[col])
-
-        if "MultipleLines" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean["MultipleLines"]):
-             df_clean["MultipleLines"] = df_clean["MultipleLines"].map({0: "No", 1: "No phone service", 2: "Yes"}).fillna(df_clean["MultipleLines"])
-
-        # 4. PaymentMethod
-        if "PaymentMethod" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean["PaymentMethod"]):
-            payment_map = {
-                0: "Bank transfer (automatic)",
-                1: "Credit card (automatic)",
-                2: "Electronic check",
-                3: "Mailed check"
-            }
-            df_clean["PaymentMethod"] = df_clean["PaymentMethod"].map(payment_map).fillna(df_clean["PaymentMethod"])
-
-        # 5. Ana Değişkenler
-        if "Contract" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean['Contract']):
-            contract_map = {0: "Month-to-month", 1: "One year", 2: "Two year"}
-            df_clean['Contract'] = df_clean['Contract'].map(contract_map).fillna(df_clean['Contract'])
-
-        if "InternetService" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean['InternetService']):
-            internet_map = {0: "DSL", 1: "Fiber optic", 2: "No Service"}
-            df_clean['InternetService'] = df_clean['InternetService'].map(internet_map).fillna(df_clean['InternetService'])
-
-        if "Churn" in df_clean.columns and pd.api.types.is_numeric_dtype(df_clean['Churn']):
-            churn_map = {0: "No", 1: "Yes"}
-            df_clean['Churn'] = df_clean['Churn'].map(churn_map).fillna(df_clean['Churn'])
-            
-    else:
+    if df_clean is None:
         st.error("Data not found.")
         st.stop()
 
-    df_probs = None
-    if probs_path.exists():
-        df_probs = pd.read_csv(probs_path) #probs dosyasını da oku
+    # bellek raporunun "önce"si okunduğu haliyle, decode dahil
+    as_read = column_memory(df_clean)
+
+    # kodlu kolonları schema.py'deki etiketlerle kopyasız Categorical'a çeviriyoruz
+    decode_frame(df_clean)
+
+    # olasılıkları yüklemede bir kez müşteri anahtarıyla ana tabloya ekliyoruz, tüm sekmeler tek frame'i kullanıyor
+    df_probs = read_table(PROBS_NAME, columns=PROBS_COLUMNS)
+    if df_probs is not None:
+        try:
+            attach_probabilities(df_clean, df_probs)
+        except ValueError as e:
+            st.warning(f"Churn probabilities could not be matched to the customers: {e}")
+
+    # her worker tüm tabloyu bellekte tutuyor: kolonları en küçük güvenli tiplere indiriyoruz
+    memory_report = compact_dtypes(df_clean, float32=float32, before=as_read)
     
-    return df_clean, df_probs #ve okunanları döndür ve yükle(aşşağıda)
+    return freeze_frame(df_clean), memory_report #ve okunanları döndür ve yükle(aşşağıda)
+
+with stage("load_data") as perf_record:
+    data_version = dataset_version() #dosyalar değişince cache yenilensin diye anahtar
+    df, memory_report = load_data(data_version, FLOAT32)
+    perf_record["rows"] = len(df)
 
-df, df_probs = load_data()
 
+@st.cache_resource(max_entries=1)
+def get_column_profile(version, _data): #kolon başına tip, değer sayısı, min/max ve seçenekler; versiyon başına bir kez
+    return build_column_profile(_data)
+
+column_profile = get_column_profile(data_version, df) #widget'lar veriyi taramadan profilden kuruluyor
 
 st.sidebar.header("Filter Panel")
 
 # --- Ana Filtreler ---
 st.sidebar.subheader("Basic Filters")
 
-contract_options = sorted(df["Contract"].unique().astype(str))
+contract_options = column_profile["Contract"]["options"]
 selected_contract = st.sidebar.multiselect("Contract Type", options=contract_options, default=contract_options)
 
-internet_options = sorted(df["InternetService"].unique().astype(str))
+internet_options = column_profile["InternetService"]["options"]
 selected_internet = st.sidebar.multiselect("Internet Service Type", options=internet_options, default=internet_options)
 
-min_tenure = int(df["tenure"].min())
-max_tenure = int(df["tenure"].max())
+min_tenure = int(column_profile["tenure"]["min"])
+max_tenure = int(column_profile["tenure"]["max"])
 selected_tenure_range = st.sidebar.slider("Tenure", min_tenure, max_tenure, (min_tenure, max_tenure))
 
 # --- Diğer Filtreler ---
@@ -124,82 +109,105 @@ st.sidebar.markdown("---")
 with st.sidebar.expander("Advanced Filters"):
     
     dynamic_filters = {}
-    exclude_columns = ['customerID', 'Contract', 'InternetService', 'tenure', 'Churn']
+    exclude_columns = ['customerID', 'Contract', 'InternetService', 'tenure', 'Churn', 'churn_probability']
     
-    for col in df.columns:
+    for col, profile in column_profile.items():
         if col not in exclude_columns:
-            unique_val_count = df[col].nunique()
-            is_numeric = pd.api.types.is_numeric_dtype(df[col])
-            
-            # Sadece 15'ten fazla değeri olan GERÇEK sayısal sütunlar için Slider
-            if is_numeric and unique_val_count > 15:
-                min_val = float(df[col].min())
-                max_val = float(df[col].max())
-                if min_val < max_val:
-                    dynamic_filters[col] = st.slider(f"{col}", min_val, max_val, (min_val, max_val))
-            else:
-                # Geri kalan her şey Multiselect olsun
-                if unique_val_count < 50: 
-                    options = sorted(df[col].unique().astype(str))
-                    dynamic_filters[col] = st.multiselect(f"{col}", options=options, default=options)
+            # Sadece 15'ten fazla değeri olan GERÇEK sayısal sütunlar için Slider, 50'den az değerliler Multiselect
+            if profile["widget"] == "slider":
+                min_val, max_val = float(profile["min"]), float(profile["max"])
+                dynamic_filters[col] = st.slider(f"{col}", min_val, max_val, (min_val, max_val))
+            elif profile["widget"] == "multiselect":
+                options = profile["options"]
+                dynamic_filters[col] = st.multiselect(f"{col}", options=options, default=options)
 
 st.sidebar.caption("Project Members: Işıl Çağlar, Mehmet Çağlar, Arsen Denisenko")
 
-def filter_dataframe(data): #dataframe filtreleme fonksiyonu
+# sidebar'daki seçimleri filtre durumuna çeviriyoruz: kategoriler için seçilen değerler, sayısallar için aralık
+selections = {"Contract": selected_contract, "InternetService": selected_internet}
+ranges = {"tenure": selected_tenure_range}
+for col, value in dynamic_filters.items():
+    if isinstance(value, tuple):
+        ranges[col] = value
+    elif isinstance(value, list):
+        selections[col] = value
+
+@st.cache_resource(max_entries=1)
+def get_filter_index(version, _data): #filtre indexi dataset versiyonu başına bir kez kuruluyor
+    return build_filter_index(_data)
+
+@st.cache_resource(max_entries=1)
+def get_cube(version, _data): #treemap/sankey/heatmap için önceden toplanmış cube
+    return build_cube(_data)
+
+def filter_dataframe(data, index): #dataframe filtreleme fonksiyonu
     if data is None: return None
-    
-    mask = (
-        (data["Contract"].astype(str).isin(selected_contract)) &
-        (data["InternetService"].astype(str).isin(selected_internet)) &
-        (data["tenure"] >= selected_tenure_range[0]) &
-        (data["tenure"] <= selected_tenure_range[1])
-    )
-    df_temp = data[mask]
-    
-    for col, value in dynamic_filters.items():
-        if isinstance(value, tuple): 
-            df_temp = df_temp[(df_temp[col] >= value[0]) & (df_temp[col] <= value[1])]
-        elif isinstance(value, list):
-            if not value: return df_temp[0:0]
-            df_temp = df_temp[df_temp[col].astype(str).isin(value)]
-            
-    return df_temp
 
-df_filtered = filter_dataframe(df) #filtreyi uygula
+    # tüm filtreler bitmask'lerle tek bir satır maskesine indirgeniyor, ara kopya yok
+    mask = resolve_filters(index, selections, ranges)
+    if mask is None: return data
+    return data[mask]
+
+with stage("filter", rows=len(df)):
+    filter_index = get_filter_index(data_version, df)
+    df_filtered = filter_dataframe(df, filter_index) #filtreyi uygula
 
-df_probs_filtered = None
-if df_probs is not None and df_filtered is not None:
-    common_indices = df_filtered.index.intersection(df_probs.index)
-    df_probs_filtered = df_probs.loc[common_indices]
+# aktif filtre durumunun parmak izi; chart modülleri figürleri bununla cache'liyor
+filter_key = filter_fingerprint(data_version, selected_contract, selected_internet, selected_tenure_range, dynamic_filters)
 
+# aktif filtrelerin hepsi cube boyutuysa chartlar ham satırlar yerine cube dilimini topluyor
+cube_view = None
+with stage("cube") as perf_record:
+    if active_filters(filter_index, selections, ranges) <= CUBE_FILTER_COLUMNS:
+        cube_view = slice_cube(get_cube(data_version, df),
+                               {col: value for col, value in selections.items() if col in CUBE_FILTER_COLUMNS},
+                               {col: value for col, value in ranges.items() if col in CUBE_FILTER_COLUMNS})
+        perf_record["rows"] = len(cube_view)
+
+has_probabilities = "churn_probability" in df.columns
 
 st.title("Telco Customer Churn Analysis") #site bilgileri ve dizaynı
 
 col1, col2, col3, col4 = st.columns(4)
 
 if df_filtered is not None:
-    total_customers = len(df_filtered)
-    churn_count = df_filtered[df_filtered["Churn"].astype(str).isin(["Yes", "1"])].shape[0]
-    churn_rate = (churn_count / total_customers * 100) if total_customers > 0 else 0
-    avg_charge = df_filtered["MonthlyCharges"].mean() if not df_filtered.empty else 0
+    with stage("kpis", rows=len(df_filtered)):
+        total_customers = len(df_filtered)
+        churn_count = int(df_filtered["Churn"].isin(["Yes", "1", 1]).sum()) #sadece maske, filtrelenmiş kopya yok
+        churn_rate = (churn_count / total_customers * 100) if total_customers > 0 else 0
+        avg_charge = df_filtered["MonthlyCharges"].mean() if not df_filtered.empty else 0
 
-    col1.metric("Total Customers", f"{total_customers:,}")
-    col2.metric("Total Churn", f"{churn_count:,}")
-    col3.metric("Percantage Churn", f"%{churn_rate:.1f}", delta_color="inverse")
-    col4.metric("Avrg. Monthly Charges", f"${avg_charge:.2f}")
+        col1.metric("Total Customers", f"{total_customers:,}")
+        col2.metric("Total Churn", f"{churn_count:,}")
+        col3.metric("Percantage Churn", f"%{churn_rate:.1f}", delta_color="inverse")
+        col4.metric("Avrg. Monthly Charges", f"${avg_charge:.2f}")
 
 st.markdown("---")
 
-tab_x, tab_y, tab_z = st.tabs(["📈 X: Lookup Data", "🔄 Y: Segmentation", "🤖 Z: Risk Model"])
-
-with tab_x:
-    if render_x_charts: render_x_charts(df_filtered)
-    else: st.info("Missing Module")
-
-with tab_y:
-    if df_filtered is not None and render_y_charts: render_y_charts(df_filtered)
-    else: st.warning("Missing Module")
-
-with tab_z:
-    if df_probs_filtered is not None and render_z_charts: render_z_charts(df_probs_filtered)
-    else: st.info("Missing Module")
\ No newline at end of file
+def render_tab_x():
+    render_x_charts = load_renderer("x")
+    if render_x_charts: render_x_charts(df_filtered, filter_key, cube_view)
+
+def render_tab_y():
+    if df_filtered is None: return
+    render_y_charts = load_renderer("y")
+    if render_y_charts: render_y_charts(df_filtered, filter_key, cube_view)
+
+def render_tab_z():
+    if df_filtered is not None and has_probabilities:
+        render_z_charts = load_renderer("z")
+        if render_z_charts: render_z_charts(df_filtered, filter_key, cube_view)
+    else: st.info("Churn probabilities not found.")
+    render_whatif_panel = load_renderer("whatif")
+    if render_whatif_panel: render_whatif_panel(df_filtered, filter_key) #model ile canlı senaryo skorlama
+
+TABS = {"📈 X: Lookup Data": render_tab_x, "🔄 Y: Segmentation": render_tab_y, "🤖 Z: Risk Model": render_tab_z}
+
+# st.tabs gizli sekmeleri de her rerun'da çalıştırıyor; radio ile sadece seçili sekme hesaplanıyor.
+# seçim session_state'te (key) kalıyor, diğer sekmelerin figürleri fig_cache'te filtre durumuyla duruyor
+active_tab = st.radio("Section", list(TABS), horizontal=True, key="active_tab", label_visibility="collapsed")
+TABS[active_tab]()
+
+# aşama dökümünü log + prometheus dosyasına yaz, ?perf=1 ise sidebar'da göster
+render_overlay(finish_rerun())
+render_memory_report(memory_report)
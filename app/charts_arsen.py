@@ -4,25 +4,17 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
-def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonksiyon
-    
-    if df.empty: #tüm filtrelerin kapalı olduğu durum için
-        st.warning("Nothing to show, please enable some filters.")
-        return
-
-    st.markdown("### 🔄 Y - Segmentation")
-    st.markdown("This part inspects the hierarchical distribution of customer groups, based on Churn, Customer type, and Spending,\
-                 to reveal which segments contribute most to revenue and which are at higher risk of cancellation.")
-    st.markdown("---")
-
-    
-    st.subheader("1. Churn Distribution ")
-    st.caption("This treemap shows the categorization of customer churn amounts and percentages by some categories , Customers are first grouped by their \
-               Internet Service Type, then they are further divided by their respective payment method and finally grouped by whether they churn or not.")
-    
-    #treemap grafiği
+from density import RENDER_MODE_LABELS, bin_centers, binned_stats, choose_render_mode, grid_edges, stratified_sample
+from cube import build_cube, rollup
+from fig_cache import cached
+from perf import plotly_chart, stage
+from schema import category_lookup
 
-    df_treemap = df.copy()
+def build_treemap_figure(cube):
+    treemap_path = ['World', 'InternetService', 'PaymentMethod', 'Churn']
+    #satırlar yerine cube hücrelerinin toplamı; her yaprak için tek satır ve müşteri sayısı
+    df_treemap = rollup(cube, treemap_path[1:])
+    df_treemap[treemap_path[1:]] = df_treemap[treemap_path[1:]].astype(str) #treemap kategorik kolonlarda boş kombinasyonlar üretmesin diye string
     df_treemap['World'] = 'All Customers' #tüm verileri çekip world olarak kaydediyoruz
     
     service_colors = { #renk bilgileri
@@ -35,7 +27,8 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
     
     fig_treemap = px.treemap( #treemap objesini bu parametrelerle oluşturuyoruz
         df_treemap, 
-        path=['World', 'InternetService', 'PaymentMethod', 'Churn'],
+        path=treemap_path,
+        values='count',
         color='InternetService', 
         color_discrete_map=service_colors,
     )
@@ -61,17 +54,9 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
         marker=dict(line=dict(width=2, color='black')),
         hovertemplate='<b>%{label}</b><br>Customer Count: %{value}<br>Group Percantage: %{percentParent:.1%}<extra></extra>'
     )
-    
-    st.plotly_chart(fig_treemap, use_container_width=True) #display the chart
-    
-    st.markdown("---")
-
-    #faceted histogram
-
-    st.subheader("2. Customer Distribution")
-    st.caption("This faceted histogram shows the distribution of customers with respect to the tenure parameter. The data is faceted by Iternet Service\
-               Type and Churn, meaning we can further inspect the customer distributon w.r.t. these two parameters simultaniously.")
+    return fig_treemap
 
+def build_histogram_figure(df):
     fig_hist = px.histogram( #initialization parametreleri
         df, 
         x="tenure", 
@@ -115,42 +100,12 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
     
     # facet başlıklarını temizliyoruz ki yandaki şekilde çıkmasın ("InternetService=DSL" -> "DSL")
     fig_hist.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
-    
-    st.plotly_chart(fig_hist, use_container_width=True) #plotu gösteriyoruz
-
-    st.markdown("---")
-
-    #strip plot
-
-    st.subheader("3. Spending Distribution")
-    st.caption("This strip plot shows the distribution of charges, both monthly and total. Customers are grouped into six types based on whether or not they churn and their contract type\
-               . Then based on their charges they are placed into the plot.")
-    
-    #total chargeları Na değerleri 0 yaparak ayıklıyoruz, hala kaldıysa tabi çünkü processed datayı kullanıyoruz
-
-    df_strip = df.copy()
-    df_strip['TotalCharges'] = pd.to_numeric(df_strip['TotalCharges'], errors='coerce').fillna(0)
-    
-    #striplerin indelenmesi
-    contract_base = {'Month-to-month': 0, 'One year': 3, 'Two year': 6}
-    churn_offset = {'Yes': 0, 'No': 1} 
-    
-    df_strip['x_pos'] = df_strip.apply(lambda row: contract_base[row['Contract']] + churn_offset[row['Churn']], axis=1)
-
-    #jitter için random bir seed seçiyoruz
-    np.random.seed(42)
-    df_strip['x_jittered'] = df_strip['x_pos'] + np.random.uniform(-0.25, 0.25, size=len(df_strip))
-
-    #churn yes veya churn noya göre filtreleme
-
-    df_yes = df_strip[df_strip['Churn'] == 'Yes']
-    df_no = df_strip[df_strip['Churn'] == 'No']
-
-    #figürü yaratıp trace ve layoutlarını yukarda yaptığımız gibi ayarlıyoruz
+    return fig_hist
 
+def build_strip_points(df_yes, df_no):
     fig_combined = go.Figure()
 
-    fig_combined.add_trace(go.Scatter(
+    fig_combined.add_trace(go.Scattergl(
         x=df_yes['x_jittered'],
         y=df_yes['MonthlyCharges'],
         mode='markers',
@@ -167,7 +122,7 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
         hovertemplate='<b>%{customdata[0]} (Churn)</b><br>Monthly: $%{y}<br>Tenure: %{customdata[1]} Month<extra></extra>'
     ))
 
-    fig_combined.add_trace(go.Scatter(
+    fig_combined.add_trace(go.Scattergl(
         x=df_no['x_jittered'],
         y=df_no['MonthlyCharges'],
         mode='markers',
@@ -183,6 +138,80 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
         customdata=np.stack((df_no['Contract'], df_no['tenure']), axis=-1),
         hovertemplate='<b>%{customdata[0]} (No Churn)</b><br>Monthly: $%{y}<br>Tenure: %{customdata[1]} Month<extra></extra>'
     ))
+    return fig_combined
+
+def build_strip_density(df_strip, df_yes, df_no, x_step=0.05, n_y_bins=60):
+    #her strip için ızgara: hücredeki müşteri sayısı ve ortalama TotalCharges (renk), boş hücreler şeffaf
+    x_edges = np.arange(-0.5, 7.5 + x_step, x_step)
+    y_edges = grid_edges(df_strip['MonthlyCharges'], n_y_bins)
+
+    fig_combined = go.Figure()
+    for part, name, colorscale, colorbar_y in [(df_yes, 'Churn', [[0, "#ffa1a0"], [1, "#CE0000"]], 0.8),
+                                               (df_no, 'No Churn', [[0, "#bef0be"], [1, "#009500"]], 0.2)]:
+        counts, mean_total = binned_stats(part['x_jittered'], part['MonthlyCharges'], part['TotalCharges'], x_edges, y_edges)
+        fig_combined.add_trace(go.Heatmap(
+            x=bin_centers(x_edges), y=bin_centers(y_edges),
+            z=mean_total.T, customdata=counts.T,
+            colorscale=colorscale,
+            colorbar=dict(title=f"Total Charges ({name})", x=1.05, len=0.5, y=colorbar_y),
+            name=name,
+            hovertemplate=f'<b>{name}</b><br>Monthly: $%{{y:.0f}}<br>Customers: %{{customdata:,}}<br>Avg Total: $%{{z:,.0f}}<extra></extra>'
+        ))
+
+    #hover için her strip'ten tabakalı örneklem
+    sample = df_strip.iloc[stratified_sample(df_strip['x_pos'].to_numpy())]
+    fig_combined.add_trace(go.Scattergl(
+        x=sample['x_jittered'],
+        y=sample['MonthlyCharges'],
+        mode='markers',
+        name='Sample',
+        marker=dict(size=4, color='rgba(255,255,255,0.6)'),
+        customdata=np.stack((sample['Contract'], sample['tenure'], sample['Churn']), axis=-1),
+        hovertemplate='<b>%{customdata[0]} (Churn: %{customdata[2]})</b><br>Monthly: $%{y}<br>Tenure: %{customdata[1]} Month<extra></extra>'
+    ))
+    return fig_combined
+
+CONTRACT_BASE = {'Month-to-month': 0, 'One year': 3, 'Two year': 6}
+CHURN_OFFSET = {'Yes': 0, 'No': 1}
+
+def strip_positions(df):
+    """Narrow frame of the strip plot columns; derived columns are new arrays, df is only read."""
+    #total chargeları Na değerleri 0 yaparak ayıklıyoruz, hala kaldıysa tabi çünkü processed datayı kullanıyoruz
+    total = pd.to_numeric(df['TotalCharges'], errors='coerce')
+    total = total.fillna(0).to_numpy() if total.hasnans else total.to_numpy()
+
+    #striplerin indelenmesi: kategori kodları üzerinden, satır satır apply yok (toplamalar yerinde)
+    x_pos = category_lookup(df['Contract'], CONTRACT_BASE)
+    x_pos += category_lookup(df['Churn'], CHURN_OFFSET)
+
+    #jitter için random bir seed seçiyoruz
+    np.random.seed(42)
+    x_jittered = np.random.uniform(-0.25, 0.25, size=len(df))
+    x_jittered += x_pos
+
+    #mevcut kolonlar view olarak geçiyor, sadece türetilen diziler yeni
+    return pd.DataFrame({
+        'x_pos': x_pos, 'x_jittered': x_jittered,
+        'MonthlyCharges': df['MonthlyCharges'].to_numpy(), 'TotalCharges': total,
+        'Contract': df['Contract'].array, 'tenure': df['tenure'].to_numpy(), 'Churn': df['Churn'].array,
+    }, copy=False)
+
+def build_strip_figure(df):
+    df_strip = strip_positions(df)
+
+    #churn yes veya churn noya göre filtreleme
+
+    df_yes = df_strip[(df_strip['Churn'] == 'Yes').to_numpy()]
+    df_no = df_strip[(df_strip['Churn'] == 'No').to_numpy()]
+
+    #figürü yaratıp trace ve layoutlarını yukarda yaptığımız gibi ayarlıyoruz
+    #çok müşteri varsa noktalar yerine sunucuda hesaplanan yoğunluk ızgarası çiziyoruz
+
+    mode = choose_render_mode(len(df_strip))
+    if mode == "density":
+        fig_combined = build_strip_density(df_strip, df_yes, df_no)
+    else:
+        fig_combined = build_strip_points(df_yes, df_no)
 
     fig_combined.update_layout(
         height=700, 
@@ -208,5 +237,51 @@ def render_y_charts(df: pd.DataFrame): #Benim (arsen) plotlarımın olduğu fonk
         ),
         yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
     )
+    return fig_combined, mode
+
+def render_y_charts(df: pd.DataFrame, fingerprint=None, cube=None): #Benim (arsen) plotlarımın olduğu fonksiyon
+    
+    if df.empty: #tüm filtrelerin kapalı olduğu durum için
+        st.warning("Nothing to show, please enable some filters.")
+        return
+
+    st.markdown("### 🔄 Y - Segmentation")
+    st.markdown("This part inspects the hierarchical distribution of customer groups, based on Churn, Customer type, and Spending,\
+                 to reveal which segments contribute most to revenue and which are at higher risk of cancellation.")
+    st.markdown("---")
 
-    st.plotly_chart(fig_combined, use_container_width=True) #ve plotu gösteriyoruz
\ No newline at end of file
+    
+    st.subheader("1. Churn Distribution ")
+    st.caption("This treemap shows the categorization of customer churn amounts and percentages by some categories , Customers are first grouped by their \
+               Internet Service Type, then they are further divided by their respective payment method and finally grouped by whether they churn or not.")
+    
+    #treemap grafiği
+
+    with stage("y.treemap", rows=len(cube) if cube is not None else len(df)) as perf_record:
+        fig_treemap = cached(fingerprint, ("y.treemap",), lambda: build_treemap_figure(cube if cube is not None else build_cube(df)))
+        plotly_chart(fig_treemap, perf_record, use_container_width=True) #display the chart
+    
+    st.markdown("---")
+
+    #faceted histogram
+
+    st.subheader("2. Customer Distribution")
+    st.caption("This faceted histogram shows the distribution of customers with respect to the tenure parameter. The data is faceted by Iternet Service\
+               Type and Churn, meaning we can further inspect the customer distributon w.r.t. these two parameters simultaniously.")
+
+    with stage("y.histogram", rows=len(df)) as perf_record:
+        fig_hist = cached(fingerprint, ("y.histogram",), lambda: build_histogram_figure(df))
+        plotly_chart(fig_hist, perf_record, use_container_width=True) #plotu gösteriyoruz
+
+    st.markdown("---")
+
+    #strip plot
+
+    st.subheader("3. Spending Distribution")
+    st.caption("This strip plot shows the distribution of charges, both monthly and total. Customers are grouped into six types based on whether or not they churn and their contract type\
+               . Then based on their charges they are placed into the plot.")
+    
+    with stage("y.strip", rows=len(df)) as perf_record:
+        fig_combined, render_mode = cached(fingerprint, ("y.strip",), lambda: build_strip_figure(df))
+        st.caption(f"Rendering mode: {RENDER_MODE_LABELS[render_mode]} ({len(df):,} customers)")
+        plotly_chart(fig_combined, perf_record, use_container_width=True) #ve plotu gösteriyoruz
\ No newline at end of file
@@ -2,66 +2,50 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import MinMaxScaler
+import numpy as np
 
-def render_z_charts(df: pd.DataFrame):
-    # 1. css
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Exo+2:wght@300;500;700&display=swap');
-    div[data-testid="stMetric"] {
-        background-color: #161B22;
-        border-left: 4px solid #FF0055;
-        color: #E0E0E0;
-    }
-    h3, h4 { color: #FF0055 !important; font-weight: 700; }
-    </style>
-    """, unsafe_allow_html=True)
-    if df.empty:
-        st.warning("nothing to show, please enable some filters.")
-        return
-    
+from cube import CHARGE_BIN_WIDTH, RISK_COLUMNS, build_cube, charge_tenure_grid, coarsen_grid
+from density import RENDER_MODE_LABELS, bin_centers, binned_stats, choose_render_mode, grid_edges, stratified_sample
+from fig_cache import cached
+from perf import fragment_run, plotly_chart, stage
+from schema import numeric_view
+from segments import CLUSTER_COLS, N_CLUSTERS, can_warm_start, fit_segments, row_mask
 
-    st.markdown("### 🤖 Z: AI Risk & Pattern Analysis")
-    
-    if df is None or df.empty:
-        st.warning("Insufficient data for analysis.")
-        return
+# tenure kovalarının ilk ayları; "Standard" eski sabit 0-12/12-24/24-48/48+ kovaları
+TENURE_BUCKETS = {
+    "Standard": [1, 13, 25, 49],
+    "Yearly": list(range(1, 73, 12)),
+    "Quarterly": list(range(1, 73, 3)),
+    "Monthly": list(range(1, 73)),
+}
 
-    # Numeric conversions
-    cols_to_numeric = ['TotalCharges', 'MonthlyCharges', 'tenure', 'churn_probability']
-    for col in cols_to_numeric:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    
-    df = df.dropna(subset=cols_to_numeric)
 
-    # ---------------------------------------------------------
-    # 1. HEATMAP (Interactive Binning)
-    # ---------------------------------------------------------
-    st.markdown("#### 1. Risk Heatmap: Tenure vs. MonthlyCharges")
-    st.caption("Dark red areas indicate the highest churn risk. Analyze the density of segments.")
+def tenure_bucket_labels(starts, n_months):
+    starts = [s for s in starts if s < n_months]
+    labels = []
+    for start, end in zip(starts, starts[1:] + [None]):
+        if end is None:
+            labels.append(f"{start - 1}+ Mo")
+        elif end - start == 1:
+            labels.append(f"{start} Mo")
+        else:
+            labels.append(f"{start - 1}-{end - 1} Mo")
+    return labels
 
-    # Interactive: Bin Size
-    col_opt1, col_opt2 = st.columns([1, 3])
-    with col_opt1:
-        bin_size = st.select_slider("Bin Size (MonthlyCharges)", options=[5, 10, 20, 25], value=10)
-    
-    df_heat = df.copy()
-    
-    # Binning Process
-    df_heat["Monthly_Bin"] = pd.cut(df_heat["MonthlyCharges"], bins=range(0, 150, bin_size), right=False)
-    df_heat["tenure_bucket"] = pd.cut(df_heat["tenure"], bins=[0, 12, 24, 48, 1000], labels=["0-12 Mo", "12-24 Mo", "24-48 Mo", "48+ Mo"])
 
-    heatmap_data = df_heat.groupby(["Monthly_Bin", "tenure_bucket"])["churn_probability"].mean().reset_index()
-    
-    # Pivot and Sort
-    heatmap_matrix = heatmap_data.pivot(index="Monthly_Bin", columns="tenure_bucket", values="churn_probability")
-    heatmap_matrix = heatmap_matrix.sort_index(ascending=False) # High charges on top
-    
-    # Convert Index to string for visualization
-    heatmap_matrix.index = heatmap_matrix.index.astype(str)
+def build_heatmap_figure(grid, bin_size, tenure_buckets="Standard"):
+    # satırlar yerine en ince ızgara: (5$ charge bin, tenure ayı) başına olasılık toplamı ve sayısı
+    sums, counts = grid
+    factor = bin_size // CHARGE_BIN_WIDTH  # bin_size 5'in katı, komşu hücreler toplanıyor
+    starts = TENURE_BUCKETS[tenure_buckets]
+    risk_sum, risk_count = coarsen_grid(sums, factor, starts), coarsen_grid(counts, factor, starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        risk = np.where(risk_count > 0, risk_sum / risk_count, np.nan)
+
+    # Pivot and Sort (High charges on top)
+    charge_labels = [f"[{low}, {low + bin_size})" for low in range(0, risk.shape[0] * bin_size, bin_size)]
+    heatmap_matrix = pd.DataFrame(risk, index=charge_labels, columns=tenure_bucket_labels(starts, sums.shape[1])).iloc[::-1]
+    heatmap_matrix.index.name, heatmap_matrix.columns.name = "Monthly_Bin", "tenure_bucket"
 
     fig1 = px.imshow(
         heatmap_matrix,
@@ -71,7 +55,7 @@ def render_z_charts(df: pd.DataFrame):
         
         color_continuous_scale="RdYlGn_r", 
         
-        text_auto=".0%", 
+        text_auto=".0%" if heatmap_matrix.size <= 400 else False, 
         aspect="auto"
     )
     fig1.update_layout(
@@ -81,25 +65,18 @@ def render_z_charts(df: pd.DataFrame):
         font=dict(color="white"),
         height=400
     )
-    st.plotly_chart(fig1, use_container_width=True)
-    # ---------------------------------------------------------
-    # 2. SCATTER PLOT (Filter: Risk Threshold)
-    # ---------------------------------------------------------
-    st.markdown("#### 2. High Risk Radar (Alarm Level)")
-    st.caption("Identify customers requiring immediate intervention based on predicted risk.")
+    return fig1
 
-    # Slider: Risk Threshold
-    risk_threshold = st.slider(
-        "🚨 Alarm Level (Risk Ratio %)", 
-        min_value=0, max_value=90, value=0, step=5, # Varsayılanı 0 yaptık ki ilk açılışta hepsi görünsün
-        help="Example: If you select 80, only customers with >= 80% churn risk will be displayed."
-    )
-    
+def build_scatter_figure(df, risk_threshold):
+    """Returns (figure, render mode, point count); figure is None when nobody passes the threshold."""
     # Filtering
     risk_mask = (df["churn_probability"] * 100) >= risk_threshold
     filtered_df = df[risk_mask]
+    if filtered_df.empty:
+        return None, None, 0
 
-    if not filtered_df.empty:
+    mode = choose_render_mode(len(filtered_df))
+    if mode == "webgl":
         fig2 = px.scatter(
             filtered_df,
             x="MonthlyCharges",
@@ -112,109 +89,279 @@ def render_z_charts(df: pd.DataFrame):
             size_max=12,
             hover_data=["tenure", "Contract", "InternetService"],
             opacity=0.8,
-            labels={"churn_probability": "Risk Score"})
-        
-        fig2.update_layout(
-            title=f"{len(filtered_df)} Customers Found with Risk >= {risk_threshold}%",
-            plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color="white"),
-            xaxis=dict(showgrid=True, gridcolor='#333', title="MonthlyCharges"),
-            yaxis=dict(showgrid=True, gridcolor='#333', title="TotalCharges"),
-            height=450 )
-        st.plotly_chart(fig2, use_container_width=True)
+            labels={"churn_probability": "Risk Score"},
+            render_mode="webgl")
     else:
-        st.warning(f"No customers found above {risk_threshold}% risk level (Good news!).")
+        fig2 = build_scatter_density(filtered_df)
+    
+    fig2.update_layout(
+        title=f"{len(filtered_df)} Customers Found with Risk >= {risk_threshold}%",
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="white"),
+        xaxis=dict(showgrid=True, gridcolor='#333', title="MonthlyCharges"),
+        yaxis=dict(showgrid=True, gridcolor='#333', title="TotalCharges"),
+        height=450 )
+    return fig2, mode, len(filtered_df)
 
-    # 3. AI SEGMENTS (Dual View: Radar & Bar)
-    st.markdown("#### 3. AI-Driven Customer Segments (Dual Analysis)")
-    st.caption("Compare behavioral DNA using Radar (Shape) and Bar (Magnitude) charts side-by-side.")
+def build_scatter_density(filtered_df, n_bins=80):
+    # çok büyük veride her müşteri yerine sunucuda hesaplanan ızgara: hücre başına ortalama risk
+    x = filtered_df["MonthlyCharges"].to_numpy(dtype=float)
+    y = filtered_df["TotalCharges"].to_numpy(dtype=float)
+    risk = filtered_df["churn_probability"].to_numpy(dtype=float)
 
-    # K-Means 
-    cluster_cols = ["tenure", "MonthlyCharges", "TotalCharges", "churn_probability"]
+    x_edges, y_edges = grid_edges(x, n_bins), grid_edges(y, n_bins)
+    counts, mean_risk = binned_stats(x, y, risk, x_edges, y_edges)
+
+    fig = go.Figure(go.Heatmap(
+        x=bin_centers(x_edges), y=bin_centers(y_edges),
+        z=mean_risk.T, customdata=counts.T,
+        colorscale="Portland", zmin=0, zmax=1,
+        colorbar=dict(title="Risk Score"),
+        hovertemplate="MonthlyCharges: %{x:.1f}<br>TotalCharges: %{y:.0f}<br>"
+                      "Avg Risk: %{z:.0%}<br>Customers: %{customdata:,}<extra></extra>"
+    ))
+
+    # hover için risk dilimlerinden tabakalı örneklem (nadir yüksek riskliler de görünsün)
+    sample = filtered_df.iloc[stratified_sample(np.minimum((risk * 10).astype(int), 9))]
+    fig.add_trace(go.Scattergl(
+        x=sample["MonthlyCharges"], y=sample["TotalCharges"],
+        mode="markers",
+        marker=dict(size=5, color=sample["churn_probability"], colorscale="Portland", cmin=0, cmax=1,
+                    line=dict(width=0.5, color="white")),
+        customdata=np.stack((sample["tenure"], sample["Contract"].astype(str),
+                             sample["InternetService"].astype(str), sample["churn_probability"]), axis=-1),
+        hovertemplate="Risk Score: %{customdata[3]:.0%}<br>tenure: %{customdata[0]}<br>"
+                      "Contract: %{customdata[1]}<br>InternetService: %{customdata[2]}<extra></extra>",
+        showlegend=False
+    ))
+    return fig
+
+def compute_segments(df, init_centers=None):
+    # K-Means (büyük veride MiniBatch, önceki merkezler varsa onlardan devam)
+    cluster_cols = CLUSTER_COLS
     df_cluster = df[cluster_cols].dropna()
 
-    kmeans = KMeans(n_clusters=4, random_state=42, n_init=10)
-    df_cluster["Cluster"] = kmeans.fit_predict(df_cluster)
+    labels, centers = fit_segments(df_cluster.to_numpy(), init_centers=init_centers)
+    df_cluster["Cluster"] = labels
     
     cluster_means = df_cluster.groupby("Cluster").mean().reset_index()
 
-    scaler = MinMaxScaler()
+    # MinMaxScaler ile aynı (sabit kolon 0 oluyor); 4 satır için sklearn import etmeye gerek yok
+    values = cluster_means[cluster_cols]
     cluster_means_scaled = cluster_means.copy()
-    cluster_means_scaled[cluster_cols] = scaler.fit_transform(cluster_means[cluster_cols])
+    cluster_means_scaled[cluster_cols] = (values - values.min()) / (values.max() - values.min()).replace(0, 1)
 
     df_melted = cluster_means_scaled.melt(id_vars="Cluster", var_name="Feature", value_name="Normalized_Value")
     df_melted["Cluster"] = df_melted["Cluster"].apply(lambda x: f"Cluster {x}")
+    return cluster_means, df_melted, {"centers": centers, "rows": row_mask(df_cluster.index)}
+
+def build_radar_figure(df_filtered, common_color_sequence):
+    fig_radar = px.line_polar(
+        df_filtered, 
+        r="Normalized_Value", 
+        theta="Feature", 
+        color="Cluster", 
+        line_close=True,
+        markers=True,
+        color_discrete_sequence=common_color_sequence, # Aynı renk paleti
+        range_r=[0, 1] # Sabit ölçek
+    )
+    fig_radar.update_traces(fill='toself', opacity=0.3)
+    fig_radar.update_layout(
+        polar=dict(
+            bgcolor="rgba(0,0,0,0)",
+            radialaxis=dict(visible=True, showticklabels=False, gridcolor="#444"),
+            angularaxis=dict(gridcolor="#444", tickfont=dict(color="white"))
+        ),
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="white"),
+        legend=dict(orientation="h", y=-0.2), # Legend altta
+        height=400,
+        margin=dict(l=40, r=40, t=20, b=20)
+    )
+    return fig_radar
+
+def build_bar_figure(df_filtered, common_color_sequence):
+    fig_bar = px.bar(
+        df_filtered, 
+        x="Feature", 
+        y="Normalized_Value", 
+        color="Cluster", 
+        barmode="group",
+        text_auto=".2f",
+        color_discrete_sequence=common_color_sequence # Aynı renk paleti
+    )
+    
+    fig_bar.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="white"),
+        xaxis=dict(showgrid=False, title=""),
+        yaxis=dict(showgrid=True, gridcolor='#333', title="Scale (0-1)", range=[0, 1]),
+        legend=dict(orientation="h", y=-0.2), # Legend altta
+        height=400,
+        margin=dict(l=20, r=20, t=20, b=20)
+    )
+    return fig_bar
 
-    # ınteractive Selection
-    all_clusters = sorted(df_melted["Cluster"].unique())
-    selected_clusters = st.multiselect(
-        "Select Segments to Compare", 
-        all_clusters, 
-        default=all_clusters[:2] )
+RISK_NUMERIC_COLS = RISK_COLUMNS  # heatmap'in cube ölçüleriyle aynı satırlar (bkz. cube.build_cube)
 
-    if selected_clusters:
-        df_filtered = df_melted[df_melted["Cluster"].isin(selected_clusters)]
+def risk_rows(df):
+    """Rows with all RISK_NUMERIC_COLS present, as numbers; returns df itself when nothing needs dropping."""
+    # Numeric conversions (girdiye yazmıyoruz, gerekirse yüzeysel kopya)
+    df = numeric_view(df, RISK_NUMERIC_COLS)
+    # kolon başına notna dizisi yerine tek maske ve tek tampon; tamsayı kolonlarda NaN olamaz
+    complete = np.ones(len(df), dtype=bool)
+    missing = np.empty(len(df), dtype=bool)
+    for col in RISK_NUMERIC_COLS:
+        values = df[col].to_numpy()
+        if values.dtype.kind == "f":
+            np.isnan(values, out=missing)
+            complete &= np.logical_not(missing, out=missing)
+    return df if complete.all() else df[complete]
+
+@st.fragment
+def heatmap_section(df, fingerprint=None, cube=None):
+    with fragment_run("z.heatmap"):
+        # Interactive: Bin Size (değişince sadece bu parça yeniden çalışıyor, filtre ve diğer grafikler değil)
+        col_opt1, col_opt2 = st.columns([1, 3])
+        with col_opt1:
+            bin_size = st.select_slider("Bin Size (MonthlyCharges)", options=[5, 10, 20, 25], value=10)
+        with col_opt2:
+            tenure_buckets = st.radio("Tenure Buckets", list(TENURE_BUCKETS), horizontal=True, key="heatmap_tenure")
+
+        with stage("z.heatmap", rows=len(cube) if cube is not None else len(df)) as perf_record:
+            # en ince ızgara filtre durumu başına bir kez; çözünürlük değişimi sadece hücreleri topluyor
+            grid = cached(fingerprint, ("z.heatmap_grid",),
+                          lambda: charge_tenure_grid(cube if cube is not None else build_cube(df, dimensions=[])))
+            fig1 = cached(fingerprint, ("z.heatmap", bin_size, tenure_buckets),
+                          lambda: build_heatmap_figure(grid, bin_size, tenure_buckets))
+            plotly_chart(fig1, perf_record, use_container_width=True)
+
+@st.fragment
+def scatter_section(df, fingerprint=None):
+    with fragment_run("z.scatter"):
+        # Slider: Risk Threshold
+        risk_threshold = st.slider(
+            "🚨 Alarm Level (Risk Ratio %)", 
+            min_value=0, max_value=90, value=0, step=5, # Varsayılanı 0 yaptık ki ilk açılışta hepsi görünsün
+            help="Example: If you select 80, only customers with >= 80% churn risk will be displayed."
+        )
+    
+        with stage("z.scatter", rows=len(df)) as perf_record:
+            fig2, render_mode, n_points = cached(fingerprint, ("z.scatter", risk_threshold),
+                                                 lambda: build_scatter_figure(df, risk_threshold))
+
+            if fig2 is not None:
+                st.caption(f"Rendering mode: {RENDER_MODE_LABELS[render_mode]} ({n_points:,} customers)")
+                plotly_chart(fig2, perf_record, use_container_width=True)
+            else:
+                st.warning(f"No customers found above {risk_threshold}% risk level (Good news!).")
+
+
+@st.fragment
+def segment_comparison(df_melted, fingerprint=None):
+    with fragment_run("z.segments"):
+        # ınteractive Selection
+        all_clusters = sorted(df_melted["Cluster"].unique())
+        selected_clusters = st.multiselect(
+            "Select Segments to Compare", 
+            all_clusters, 
+            default=all_clusters[:2] )
+
+        if selected_clusters:
+            df_filtered = df_melted[df_melted["Cluster"].isin(selected_clusters)]
         
-        common_color_sequence = px.colors.qualitative.Bold
-
-        # EKRANI İKİYE BÖLME
-        col_radar, col_bar = st.columns(2)
-
-        # SOL: RADAR CHART 
-        with col_radar:
-            st.markdown("**Shape Analysis (Radar)**")
-            fig_radar = px.line_polar(
-                df_filtered, 
-                r="Normalized_Value", 
-                theta="Feature", 
-                color="Cluster", 
-                line_close=True,
-                markers=True,
-                color_discrete_sequence=common_color_sequence, # Aynı renk paleti
-                range_r=[0, 1] # Sabit ölçek
-            )
-            fig_radar.update_traces(fill='toself', opacity=0.3)
-            fig_radar.update_layout(
-                polar=dict(
-                    bgcolor="rgba(0,0,0,0)",
-                    radialaxis=dict(visible=True, showticklabels=False, gridcolor="#444"),
-                    angularaxis=dict(gridcolor="#444", tickfont=dict(color="white"))
-                ),
-                paper_bgcolor="rgba(0,0,0,0)",
-                font=dict(color="white"),
-                legend=dict(orientation="h", y=-0.2), # Legend altta
-                height=400,
-                margin=dict(l=40, r=40, t=20, b=20)
-            )
-            st.plotly_chart(fig_radar, use_container_width=True)
-
-        # SAĞ: BAR CHART 
-        with col_bar:
-            st.markdown("**Magnitude Analysis (Bar)**")
-            fig_bar = px.bar(
-                df_filtered, 
-                x="Feature", 
-                y="Normalized_Value", 
-                color="Cluster", 
-                barmode="group",
-                text_auto=".2f",
-                color_discrete_sequence=common_color_sequence # Aynı renk paleti
-            )
-            
-            fig_bar.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color="white"),
-                xaxis=dict(showgrid=False, title=""),
-                yaxis=dict(showgrid=True, gridcolor='#333', title="Scale (0-1)", range=[0, 1]),
-                legend=dict(orientation="h", y=-0.2), # Legend altta
-                height=400,
-                margin=dict(l=20, r=20, t=20, b=20)
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+            common_color_sequence = px.colors.qualitative.Bold
 
-    else:
-        st.info("Please select at least one segment to view the chart.")
+            # EKRANI İKİYE BÖLME
+            col_radar, col_bar = st.columns(2)
+
+            # SOL: RADAR CHART 
+            with col_radar:
+                st.markdown("**Shape Analysis (Radar)**")
+                with stage("z.radar", rows=len(df_filtered)) as perf_record:
+                    fig_radar = cached(fingerprint, ("z.radar", tuple(selected_clusters)),
+                                       lambda: build_radar_figure(df_filtered, common_color_sequence))
+                    plotly_chart(fig_radar, perf_record, use_container_width=True)
+
+            # SAĞ: BAR CHART 
+            with col_bar:
+                st.markdown("**Magnitude Analysis (Bar)**")
+                with stage("z.bar", rows=len(df_filtered)) as perf_record:
+                    fig_bar = cached(fingerprint, ("z.bar", tuple(selected_clusters)),
+                                     lambda: build_bar_figure(df_filtered, common_color_sequence))
+                    plotly_chart(fig_bar, perf_record, use_container_width=True)
+
+        else:
+            st.info("Please select at least one segment to view the chart.")
+
+
+def render_z_charts(df: pd.DataFrame, fingerprint=None, cube=None):
+    # 1. css
+    st.markdown("""
+    <style>
+    @import url('https://fonts.googleapis.com/css2?family=Exo+2:wght@300;500;700&display=swap');
+    div[data-testid="stMetric"] {
+        background-color: #161B22;
+        border-left: 4px solid #FF0055;
+        color: #E0E0E0;
+    }
+    h3, h4 { color: #FF0055 !important; font-weight: 700; }
+    </style>
+    """, unsafe_allow_html=True)
+    if df.empty:
+        st.warning("nothing to show, please enable some filters.")
+        return
+    
+
+    st.markdown("### 🤖 Z: AI Risk & Pattern Analysis")
+    
+    if df is None or df.empty:
+        st.warning("Insufficient data for analysis.")
+        return
+
+    df = risk_rows(df)
+
+    # ---------------------------------------------------------
+    # 1. HEATMAP (Interactive Binning)
+    # ---------------------------------------------------------
+    st.markdown("#### 1. Risk Heatmap: Tenure vs. MonthlyCharges")
+    st.caption("Dark red areas indicate the highest churn risk. Analyze the density of segments.")
+
+    heatmap_section(df, fingerprint, cube)
+    # ---------------------------------------------------------
+    # 2. SCATTER PLOT (Filter: Risk Threshold)
+    # ---------------------------------------------------------
+    st.markdown("#### 2. High Risk Radar (Alarm Level)")
+    st.caption("Identify customers requiring immediate intervention based on predicted risk.")
+
+    scatter_section(df, fingerprint)
+
+    # 3. AI SEGMENTS (Dual View: Radar & Bar)
+    st.markdown("#### 3. AI-Driven Customer Segments (Dual Analysis)")
+    st.caption("Compare behavioral DNA using Radar (Shape) and Bar (Magnitude) charts side-by-side.")
+
+    if len(df) < N_CLUSTERS:
+        st.info("Not enough customers to build segments.")
+        return
+
+    # ortak önbellekte yalnızca deterministik soğuk fit var; warm start sonucu oturuma ait kalıyor
+    previous = st.session_state.get("segment_model")
+    with stage("z.segments", rows=len(df)):
+        if previous is not None and fingerprint is not None and previous["fingerprint"] == fingerprint:
+            cluster_means, df_melted = previous["result"]
+            segment_model = previous
+        elif can_warm_start(previous, row_mask(df[CLUSTER_COLS].dropna().index)):
+            # filtre öncekiyle büyük ölçüde aynı satırları seçiyorsa önceki merkezlerden başlıyoruz
+            cluster_means, df_melted, segment_model = compute_segments(df, previous["centers"])
+        else:
+            cluster_means, df_melted, segment_model = cached(fingerprint, ("z.segments",),
+                                                             lambda: compute_segments(df))
+    st.session_state["segment_model"] = {**segment_model, "fingerprint": fingerprint,
+                                         "result": (cluster_means, df_melted)}
+
+    segment_comparison(df_melted, fingerprint)
 
     # data Table
     with st.expander("View Actual Cluster Means (Real Values)"):
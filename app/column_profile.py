@@ -0,0 +1,41 @@
+"""Per-column profile of the dataset for building the sidebar filters.
+
+Computed once per dataset version: dtype, number of distinct values,
+min/max, the sorted options and which widget the column gets. The sidebar
+reads the widgets' arguments from here instead of scanning the frame on
+every rerun.
+"""
+import pandas as pd
+
+# en az bu kadar farklı değeri olan sayısal kolonlar slider, diğerleri multiselect
+SLIDER_MIN_UNIQUE = 15
+# bundan fazla seçeneği olan kategorik kolonlar için filtre yok (filter_index de aynı sınırı kullanıyor)
+MAX_OPTIONS = 50
+
+
+def n_options(series: pd.Series) -> int:
+    """Distinct values of series, NaN included: it is an option ("nan") of its own."""
+    return int(series.nunique(dropna=False))
+
+
+def profile_column(series: pd.Series) -> dict:
+    is_numeric = pd.api.types.is_numeric_dtype(series)
+    n_unique = n_options(series)
+    profile = {"dtype": str(series.dtype), "nunique": n_unique, "numeric": is_numeric,
+               "min": None, "max": None, "options": None, "widget": None}
+
+    if is_numeric and len(series):
+        profile["min"], profile["max"] = series.min(), series.max()
+
+    if is_numeric and n_unique > SLIDER_MIN_UNIQUE:
+        if profile["min"] < profile["max"]:
+            profile["widget"] = "slider"
+    elif n_unique < MAX_OPTIONS:
+        profile["options"] = sorted(series.unique().astype(str))
+        profile["widget"] = "multiselect"
+    return profile
+
+
+def build_column_profile(df: pd.DataFrame) -> dict:
+    """{column: profile} for every column of df."""
+    return {col: profile_column(df[col]) for col in df.columns}
@@ -0,0 +1,113 @@
+"""Pre-aggregated cube for the treemap, Sankey and risk heatmap.
+
+Rows are grouped once per dataset version by the categorical dimensions
+those charts use, plus tenure month and a 5-dollar MonthlyCharges bin. The
+cube keeps the row count, the MonthlyCharges sum and the churn_probability
+sum/count of every cell; the probability measures only cover the rows with
+every RISK_COLUMNS value, the rows the scatter plot shows (charts_isil.risk_rows). Filters on cube dimensions are answered by
+selecting cube cells, and the charts roll the selected cells up, so their
+cost depends on the number of cells and not on the number of rows.
+"""
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ["Contract", "InternetService", "PaymentMethod", "TechSupport", "Churn"]
+CUBE_KEYS = CUBE_DIMENSIONS + ["tenure", "charge_bin"]
+MEASURES = ["count", "MonthlyCharges_sum", "churn_probability_sum", "churn_probability_count"]
+
+CHARGE_BIN_WIDTH = 5
+
+# risk grafiklerinin (heatmap, scatter) satırları: bu kolonlardan biri eksikse satır dışarıda
+RISK_COLUMNS = ["TotalCharges", "MonthlyCharges", "tenure", "churn_probability"]
+
+# sidebar'da bu kolonlar dışında bir filtre aktifse cube kullanılamıyor
+CUBE_FILTER_COLUMNS = set(CUBE_DIMENSIONS) | {"tenure"}
+
+
+def build_cube(df: pd.DataFrame, probabilities=None, dimensions=CUBE_DIMENSIONS) -> pd.DataFrame:
+    """Aggregates df by dimensions + tenure + charge_bin.
+
+    probabilities defaults to df['churn_probability'] if present. Frames
+    without the categorical dimensions (e.g. the probs table) can pass a
+    shorter dimensions list.
+    """
+    tenure = pd.to_numeric(df["tenure"], errors="coerce")
+    charges = pd.to_numeric(df["MonthlyCharges"], errors="coerce")
+
+    frame = pd.DataFrame({dim: df[dim] for dim in dimensions})
+    # NaN anahtarlar -1 olarak kalıyor ki satır sayıları kaybolmasın
+    frame["tenure"] = tenure.fillna(-1).astype(np.int16)
+    frame["charge_bin"] = (charges // CHARGE_BIN_WIDTH).fillna(-1).astype(np.int16)
+    frame["count"] = np.ones(len(df), dtype=np.int64)
+    frame["MonthlyCharges_sum"] = charges.fillna(0)
+
+    if probabilities is None and "churn_probability" in df.columns:
+        probabilities = df["churn_probability"]
+    if probabilities is not None:
+        probabilities = pd.to_numeric(probabilities.reindex(df.index), errors="coerce")
+        # scatter ile aynı satırlar: diğer risk kolonları da dolu olmalı
+        complete = probabilities.notna().to_numpy() & tenure.notna().to_numpy() & charges.notna().to_numpy()
+        if "TotalCharges" in df.columns:
+            complete &= pd.to_numeric(df["TotalCharges"], errors="coerce").notna().to_numpy()
+        frame["churn_probability_sum"] = probabilities.where(complete, 0)
+        frame["churn_probability_count"] = complete.astype(np.int64)
+
+    return frame.groupby(list(dimensions) + ["tenure", "charge_bin"], observed=True, sort=False, dropna=False).sum().reset_index()
+
+
+def slice_cube(cube: pd.DataFrame, selections=None, ranges=None) -> pd.DataFrame:
+    """Keeps the cells matching the filter state (selected labels, inclusive tenure range)."""
+    mask = np.ones(len(cube), dtype=bool)
+    for col, selected in (selections or {}).items():
+        values = cube[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # hücre başına etiket dizisi üretmeden kategori başına karar; son eleman NaN (-1 kodu) için
+            categories = values.cat.categories.astype(str)
+            lookup = np.append(categories.isin(selected), "nan" in selected)
+            mask &= lookup[values.array.codes]
+        else:
+            mask &= values.astype(str).isin(selected).to_numpy()
+    for col, (low, high) in (ranges or {}).items():
+        mask &= ((cube[col] >= low) & (cube[col] <= high)).to_numpy()
+    return cube[mask]
+
+
+def rollup(cube: pd.DataFrame, dims, observed=True) -> pd.DataFrame:
+    """Sums the measures over every dimension not in dims."""
+    measures = [m for m in MEASURES if m in cube.columns]
+    return cube.groupby(dims, observed=observed, sort=False, dropna=False)[measures].sum().reset_index()
+
+
+def charge_tenure_grid(cube: pd.DataFrame):
+    """Dense (charge_bin x tenure month) arrays of the churn_probability sum and count.
+
+    The grid ends at the highest charge bin and tenure month with a scored
+    row. This is the finest heatmap resolution; coarser ones come from
+    coarsen_grid, so a resolution change costs O(cells) instead of a pass
+    over the rows.
+    """
+    cells = rollup(cube, ["charge_bin", "tenure"])
+    # bilinmeyen (-1) anahtarlar ve olasılığı olmayan hücreler ızgaraya girmiyor
+    valid = ((cells["charge_bin"] >= 0) & (cells["tenure"] >= 0) & (cells["churn_probability_count"] > 0)).to_numpy()
+    n_charge = int(cells["charge_bin"].to_numpy()[valid].max()) + 1 if valid.any() else 1
+    n_tenure = int(cells["tenure"].to_numpy()[valid].max()) + 1 if valid.any() else 1
+    flat = cells["charge_bin"].to_numpy()[valid].astype(np.int64) * n_tenure + cells["tenure"].to_numpy()[valid]
+
+    def dense(values):
+        return np.bincount(flat, weights=values[valid], minlength=n_charge * n_tenure).reshape(n_charge, n_tenure)
+
+    return dense(cells["churn_probability_sum"].to_numpy(dtype=float)), dense(cells["churn_probability_count"].to_numpy(dtype=float))
+
+
+def coarsen_grid(grid: np.ndarray, charge_factor: int, tenure_starts) -> np.ndarray:
+    """Sums charge_factor neighbouring charge rows and the tenure columns of each bucket.
+
+    tenure_starts are the first month of every tenure bucket, ascending; the
+    last bucket runs to the end of the grid and months before the first are
+    left out.
+    """
+    n_rows = -(-grid.shape[0] // charge_factor) * charge_factor
+    padded = np.pad(grid, ((0, n_rows - grid.shape[0]), (0, 0)))
+    rows = padded.reshape(-1, charge_factor, grid.shape[1]).sum(axis=1)
+    starts = [s for s in tenure_starts if s < grid.shape[1]]
+    return np.add.reduceat(rows, starts, axis=1) if starts else rows[:, :0]
@@ -0,0 +1,192 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# TELCO_DATA_DIR ile başka bir veri klasörü (ör. benchmarks/data/<satır>) kullanılabiliyor
+DATA_DIR = Path(os.environ.get("TELCO_DATA_DIR", Path(__file__).resolve().parent.parent / "data" / "processed"))
+
+# train aşamasının kaydettiği model (skorlama işi ve what-if paneli kullanıyor)
+MODEL_PATH = Path(os.environ.get("TELCO_MODEL_PATH", Path(__file__).resolve().parent.parent / "models" / "churn_model.joblib"))
+
+# TELCO_FLOAT32=1: ücretler ve olasılıklar float32 olarak tutuluyor (bkz. schema.compact_dtypes)
+FLOAT32 = os.environ.get("TELCO_FLOAT32", "0") == "1"
+
+PROCESSED_NAME = "Telco_processed"
+PROBS_NAME = "telco_churn_with_probs"
+
+CUSTOMER_KEY = "customerID"
+# anahtar olmayan eski dosyalarda satır sırası bu kolonlarla doğrulanıyor
+ALIGNMENT_COLUMNS = ["tenure", "MonthlyCharges", "TotalCharges"]
+# probs dosyasından sadece birleştirme için gereken kolonlar okunuyor
+PROBS_COLUMNS = [CUSTOMER_KEY, "churn_probability"] + ALIGNMENT_COLUMNS
+
+SCHEMA_KEY = b"telco.schema"
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Stores integer code columns in the smallest integer type that fits."""
+    columns = {}
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            columns[col] = pd.to_numeric(df[col], downcast="integer")
+        else:
+            columns[col] = df[col]
+    return pd.DataFrame(columns)
+
+
+def _with_schema_metadata(schema, df: pd.DataFrame, rows):
+    metadata = dict(schema.metadata or {})
+    metadata[SCHEMA_KEY] = json.dumps({
+        "rows": rows,
+        "columns": {col: str(dtype) for col, dtype in df.dtypes.items()},
+    }).encode("utf-8")
+    return schema.with_metadata(metadata)
+
+
+def write_columnar(df: pd.DataFrame, path, compression="zstd"):
+    """Writes a typed, compressed Parquet file with the column schema in its metadata.
+
+    Categorical columns stay integer codes (int8 after compact_frame), not
+    dictionary-encoded labels: the model, score and incremental jobs read
+    the file back as LabelEncoder codes, and the chunked writers need one
+    fixed schema for every chunk. The labels live in schema.CATEGORICAL_COLUMNS;
+    the app restores them with schema.decode_frame without copying the codes.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = compact_frame(df)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata(_with_schema_metadata(table.schema, df, len(df)).metadata)
+
+    pq.write_table(table, path, compression=compression)
+
+
+def columnar_writer(path, first_chunk: pd.DataFrame, rows=None, compression="zstd"):
+    """ParquetWriter for writing a table chunk by chunk, typed after first_chunk.
+
+    Pass every chunk through write_columnar_chunk so later chunks are cast to
+    the same schema. rows is stored in the metadata when known upfront.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    first_chunk = compact_frame(first_chunk)
+    schema = pa.Schema.from_pandas(first_chunk, preserve_index=False)
+    return pq.ParquetWriter(path, _with_schema_metadata(schema, first_chunk, rows), compression=compression)
+
+
+def write_columnar_chunk(writer, chunk: pd.DataFrame):
+    import pyarrow as pa
+
+    writer.write_table(pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False))
+
+
+def read_schema(path) -> dict:
+    """Returns the schema stored by write_columnar (empty for foreign files)."""
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(path).metadata or {}
+    if SCHEMA_KEY not in metadata:
+        return {}
+    return json.loads(metadata[SCHEMA_KEY])
+
+
+def read_columnar(path, columns=None) -> pd.DataFrame:
+    """Reads a Parquet file, only materializing the requested columns."""
+    import pyarrow.parquet as pq
+
+    if columns is not None:
+        available = pq.read_schema(path).names
+        columns = [c for c in columns if c in available]
+    return pq.read_table(path, columns=columns).to_pandas()
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """A copy of df whose column buffers are read-only, one array per column.
+
+    Meant for the process-wide dataset shared by every session: writing into
+    a column raises instead of silently changing the data of other sessions,
+    and with pandas copy-on-write, subsets and shallow copies taken from it
+    share these buffers until they are modified.
+    """
+    columns = {}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = np.array(values.cat.codes.to_numpy())
+            codes.flags.writeable = False
+            columns[col] = pd.Categorical.from_codes(codes, dtype=values.dtype, validate=False)
+        elif isinstance(values.dtype, np.dtype):
+            array = np.array(values.to_numpy())
+            array.flags.writeable = False
+            columns[col] = array
+        else:
+            columns[col] = values.array  # diğer extension tipleri olduğu gibi
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def dataset_version(data_dir=DATA_DIR) -> tuple:
+    """Identifies the current data files by name, size and modification time."""
+    data_dir = Path(data_dir)
+    if not data_dir.exists():
+        return ()
+    paths = sorted(p for p in data_dir.iterdir() if p.suffix in (".csv", ".parquet"))
+    return tuple((p.name, p.stat().st_size, p.stat().st_mtime_ns) for p in paths)
+
+
+def read_table(name, columns=None, data_dir=DATA_DIR):
+    """Loads `name` from data_dir, preferring Parquet and falling back to CSV.
+
+    Returns None when neither file exists.
+    """
+    data_dir = Path(data_dir)
+    parquet_path = data_dir / f"{name}.parquet"
+    csv_path = data_dir / f"{name}.csv"
+
+    if parquet_path.exists():
+        try:
+            return read_columnar(parquet_path, columns)
+        except ImportError:
+            pass  # pyarrow yoksa csv'ye düşüyoruz
+
+    if csv_path.exists():
+        usecols = (lambda c: c in columns) if columns is not None else None
+        return pd.read_csv(csv_path, usecols=usecols)
+
+    return None
+
+
+def attach_probabilities(df: pd.DataFrame, probs: pd.DataFrame) -> pd.DataFrame:
+    """Adds probs' churn_probability to df in place, aligned customer by customer.
+
+    Both tables are joined on CUSTOMER_KEY when they have it; the keys of
+    probs must be unique and every customer of df must be scored. Files
+    without the key are aligned by position, which is only accepted when
+    the row counts match and the ALIGNMENT_COLUMNS agree. Raises ValueError
+    otherwise.
+    """
+    if CUSTOMER_KEY in df.columns and CUSTOMER_KEY in probs.columns:
+        keys = pd.Index(probs[CUSTOMER_KEY])
+        if not keys.is_unique:
+            raise ValueError(f"duplicate {CUSTOMER_KEY} values in the probabilities")
+        positions = keys.get_indexer(df[CUSTOMER_KEY])
+        missing = int((positions < 0).sum())
+        if missing:
+            raise ValueError(f"{missing:,} customers have no churn probability")
+        values = probs["churn_probability"].to_numpy()[positions]
+    else:
+        if len(df) != len(probs):
+            raise ValueError(f"row counts differ ({len(df):,} customers, {len(probs):,} probabilities)")
+        for col in ALIGNMENT_COLUMNS:
+            if col in df.columns and col in probs.columns and not np.allclose(
+                    pd.to_numeric(df[col], errors="coerce"), pd.to_numeric(probs[col], errors="coerce"),
+                    equal_nan=True):
+                raise ValueError(f"rows are not aligned ({col} differs)")
+        values = probs["churn_probability"].to_numpy()
+
+    df["churn_probability"] = values
+    return df
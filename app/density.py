@@ -0,0 +1,64 @@
+"""Adaptive rendering helpers for point charts with many customers.
+
+Up to DENSITY_ROWS points are drawn with WebGL (Scattergl). Above that the
+points are aggregated on the server into a 2D grid (count and mean of a
+value per cell), and only a stratified sample of rows is sent as hoverable
+markers, so the payload no longer grows with the row count.
+"""
+import numpy as np
+
+DENSITY_ROWS = 100_000
+HOVER_SAMPLES = 2_000
+
+RENDER_MODE_LABELS = {
+    "webgl": "WebGL points (Scattergl)",
+    "density": "Density grid + sampled hover points",
+}
+
+
+def choose_render_mode(n_rows, density_rows=DENSITY_ROWS):
+    return "density" if n_rows > density_rows else "webgl"
+
+
+def grid_edges(values, n_bins):
+    """Evenly spaced bin edges covering the finite values."""
+    values = np.asarray(values, dtype=float)
+    finite = values[np.isfinite(values)]
+    low, high = (finite.min(), finite.max()) if finite.size else (0.0, 1.0)
+    if high <= low:
+        high = low + 1.0
+    return np.linspace(low, high, n_bins + 1)
+
+
+def binned_stats(x, y, values, x_edges, y_edges):
+    """Row counts and the mean of values for every (x, y) cell; empty cells are NaN."""
+    counts, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+    sums, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges], weights=values)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(counts > 0, sums / counts, np.nan)
+    return counts, means
+
+
+def bin_centers(edges):
+    return (edges[:-1] + edges[1:]) / 2
+
+
+def stratified_sample(strata, n_samples=HOVER_SAMPLES, seed=42):
+    """Sorted row positions with up to n_samples / n_strata random rows of each stratum.
+
+    Small strata (e.g. the highest risk decile) keep all their rows, so rare
+    outliers stay hoverable next to the dense grid.
+    """
+    strata = np.asarray(strata)
+    if strata.size == 0:
+        return np.array([], dtype=np.intp)
+
+    _, inverse = np.unique(strata, return_inverse=True)
+    counts = np.bincount(inverse)
+    per_stratum = max(1, n_samples // len(counts))
+
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(inverse)), inverse))
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    rank = np.arange(len(order)) - starts
+    return np.sort(order[rank < per_stratum])
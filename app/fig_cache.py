@@ -0,0 +1,114 @@
+"""Process-wide cache for figures and aggregates keyed on the filter state.
+
+Chart builders are deterministic given the filtered data and their own
+widget values, so a figure can be reused whenever the same filter state and
+widget values come back, across reruns and sessions.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+
+MAX_ENTRIES = 128
+MAX_BYTES = 256 * 2**20
+
+
+def estimate_bytes(value) -> int:
+    """Approximate memory held by a cached value (figure, frame, array or a tuple of them)."""
+    if hasattr(value, "to_plotly_json"):
+        return estimate_bytes(value.to_plotly_json())
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (int, float, str)):
+            # skaler listesi (trace koordinatları): ilk elemanın boyutuyla tahmin yeterli
+            return sys.getsizeof(value) + len(value) * sys.getsizeof(value[0])
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class FigureCache:
+    """LRU mapping bounded by entry count and estimated bytes, with hit/miss counters."""
+
+    def __init__(self, maxsize=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Returns the cached value for key, calling build() on a miss."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+
+        value = build()
+        size = estimate_bytes(value)
+        if size > self.max_bytes:
+            return value  # tek başına sınırı aşan değer önbelleği boşaltmasın
+
+        with self._lock:
+            if key in self._items:
+                self.bytes -= self._sizes[key]
+            self._items[key] = value
+            self._sizes[key] = size
+            self.bytes += size
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize or self.bytes > self.max_bytes:
+                old_key, _ = self._items.popitem(last=False)
+                self.bytes -= self._sizes.pop(old_key)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.hits = self.misses = self.bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items), "maxsize": self.maxsize,
+                    "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+def _normalize(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        # multiselect seçim sırası sonucu değiştirmiyor
+        return tuple(sorted(map(str, value)))
+    if isinstance(value, tuple):
+        return tuple(_normalize(v) for v in value)
+    return value
+
+
+def filter_fingerprint(*parts) -> str:
+    """Short, stable hash of a filter state (dataset version, widget values...)."""
+    return hashlib.blake2b(repr(_normalize(parts)).encode("utf-8"), digest_size=12).hexdigest()
+
+
+@st.cache_resource
+def get_figure_cache(maxsize=MAX_ENTRIES, max_bytes=MAX_BYTES) -> FigureCache:
+    return FigureCache(maxsize, max_bytes)
+
+
+def cached(fingerprint, key, build):
+    """Builds through the shared cache; without a fingerprint it just calls build()."""
+    if fingerprint is None:
+        return build()
+    return get_figure_cache().get_or_build((fingerprint,) + tuple(key), build)
@@ -0,0 +1,104 @@
+"""Precomputed row index for the sidebar filters.
+
+The index is built once per dataset: every (column, value) pair of a
+low-cardinality column gets a packed bitmask of the rows holding that value,
+and every numeric column gets its values sorted together with the row order.
+A filter state is then answered with bitwise OR/AND over the packed masks
+instead of scanning and copying the frame once per filter.
+"""
+import numpy as np
+import pandas as pd
+
+from column_profile import MAX_OPTIONS, n_options
+
+
+def build_filter_index(df: pd.DataFrame, max_options=MAX_OPTIONS) -> dict:
+    """Builds bitmasks for columns with fewer than max_options values and sorted arrays for numeric ones.
+
+    The cardinality rule is column_profile's, so every multiselect column has bitmasks.
+    """
+    bitmaps = {}
+    sorted_columns = {}
+
+    for col in df.columns:
+        series = df[col]
+        is_numeric = pd.api.types.is_numeric_dtype(series)
+
+        if n_options(series) < max_options:
+            # NaN kendi kodunu alsın ki multiselect'teki "nan" seçeneği de çalışsın
+            codes, uniques = pd.factorize(series, use_na_sentinel=False)
+            labels = np.asarray(uniques).astype(str)
+            bitmaps[col] = {label: np.packbits(codes == i) for i, label in enumerate(labels)}
+
+        if is_numeric:
+            values = series.to_numpy()
+            order = np.argsort(values, kind="stable")
+            sorted_columns[col] = (values[order], order)
+
+    return {"rows": len(df), "bitmaps": bitmaps, "sorted": sorted_columns}
+
+
+def _select_values(index, col, selected):
+    """OR of the bitmasks of the selected values, or None when every value is selected."""
+    col_bitmaps = index["bitmaps"][col]
+    selected = set(selected)
+    if selected.issuperset(col_bitmaps):
+        return None
+
+    packed = np.zeros((index["rows"] + 7) // 8, dtype=np.uint8)
+    for value in selected & col_bitmaps.keys():
+        np.bitwise_or(packed, col_bitmaps[value], out=packed)
+    return packed
+
+
+def _range_bounds(index, col, low, high):
+    """Positions of the first and one past the last sorted value within [low, high]."""
+    sorted_values, _ = index["sorted"][col]
+    return np.searchsorted(sorted_values, low, side="left"), np.searchsorted(sorted_values, high, side="right")
+
+
+def _select_range(index, col, low, high):
+    """Bitmask of rows with low <= value <= high, or None when the range covers every row."""
+    start, stop = _range_bounds(index, col, low, high)
+    if start == 0 and stop == index["rows"]:
+        return None
+
+    _, order = index["sorted"][col]
+    mask = np.zeros(index["rows"], dtype=bool)
+    mask[order[start:stop]] = True
+    return np.packbits(mask)
+
+
+def active_filters(index, selections=None, ranges=None) -> set:
+    """Columns whose filter removes at least one row."""
+    active = {col for col, selected in (selections or {}).items()
+              if not set(selected).issuperset(index["bitmaps"][col])}
+    for col, (low, high) in (ranges or {}).items():
+        start, stop = _range_bounds(index, col, low, high)
+        if start > 0 or stop < index["rows"]:
+            active.add(col)
+    return active
+
+
+def resolve_filters(index, selections=None, ranges=None):
+    """Combines the active filters into one boolean row mask.
+
+    selections maps a column to the list of selected (string) values, ranges
+    maps a column to an inclusive (low, high) tuple. Returns None when no
+    filter removes any row.
+    """
+    packed = None
+    parts = [_select_values(index, col, selected) for col, selected in (selections or {}).items()]
+    parts += [_select_range(index, col, low, high) for col, (low, high) in (ranges or {}).items()]
+
+    for part in parts:
+        if part is None:
+            continue
+        if packed is None:
+            packed = part.copy()
+        else:
+            np.bitwise_and(packed, part, out=packed)
+
+    if packed is None:
+        return None
+    return np.unpackbits(packed, count=index["rows"]).view(bool)
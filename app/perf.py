@@ -0,0 +1,239 @@
+"""Per-rerun stage timing for the dashboard.
+
+Every stage of a rerun (loading, filtering, each chart section...) is
+wrapped in `stage()`, which records its wall time and the number of rows it
+processed. At the end of the rerun `finish_rerun()` appends the breakdown to
+a rotating JSON-lines log and refreshes a Prometheus text file with the
+running totals per stage and the figure cache counters; both live under
+logs/ (or PERF_LOG_DIR).
+
+A fragment rerun (st.fragment) does not run the script, so the fragment
+bodies are wrapped in `fragment_run()`: inside a full rerun it adds nothing,
+in a fragment-only run it opens a separate record for the fragment and
+finishes it like a rerun. Which kind of run it is comes from the script run
+itself, so a full rerun cut short by st.rerun()/st.stop() before
+`finish_rerun()` does not leave a record that later fragments append to.
+
+With `?perf=1` in the URL, figure payload sizes are measured too (this
+serializes every figure once more) and `render_overlay()` shows the current
+rerun's breakdown in the sidebar (a fragment rerun's below the fragment).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from fig_cache import get_figure_cache
+
+LOG_DIR = Path(os.environ.get("PERF_LOG_DIR", Path(__file__).resolve().parent.parent / "logs"))
+LOG_MAX_BYTES = 1_000_000
+LOG_BACKUPS = 3
+METRICS_FILE = "dashboard_metrics.prom"
+
+_RERUN_KEY = "perf_rerun"
+
+
+def enabled() -> bool:
+    """Whether the overlay (and payload measuring) was requested with ?perf=1."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return False  # streamlit oturumu dışında (ör. benchmark betikleri)
+    return st.query_params.get("perf") == "1"
+
+
+def start_rerun(fragment=None):
+    st.session_state[_RERUN_KEY] = {"started": time.time(), "stages": [], "fragment": fragment, "finished": False}
+
+
+def _current():
+    if _RERUN_KEY not in st.session_state:
+        start_rerun()
+    return st.session_state[_RERUN_KEY]
+
+
+@contextmanager
+def stage(name, rows=None):
+    """Times the enclosed block; the yielded dict can take 'rows' and 'bytes' values."""
+    record = {"stage": name, "rows": rows, "bytes": None}
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        _current()["stages"].append(record)
+
+
+def plotly_chart(fig, record=None, **kwargs):
+    """st.plotly_chart that stores the figure's JSON size in record when perf is enabled."""
+    if record is not None and fig is not None and enabled():
+        record["bytes"] = (record["bytes"] or 0) + len(fig.to_json())
+    st.plotly_chart(fig, **kwargs)
+
+
+class _MetricStore:
+    """Process-wide running totals per stage, shared by all sessions."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {}
+        self.reruns = 0
+        self.fragment_reruns = 0
+        self.figure_cache = None
+        self.logger = None
+
+    def get_logger(self):
+        with self.lock:
+            if self.logger is None:
+                LOG_DIR.mkdir(parents=True, exist_ok=True)
+                logger = logging.getLogger("dashboard.perf")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                if not logger.handlers:
+                    handler = RotatingFileHandler(LOG_DIR / "perf.log", maxBytes=LOG_MAX_BYTES,
+                                                  backupCount=LOG_BACKUPS, encoding="utf-8")
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    logger.addHandler(handler)
+                self.logger = logger
+            return self.logger
+
+    def add(self, stages, figure_cache=None, fragment=None):
+        with self.lock:
+            if fragment is None:
+                self.reruns += 1
+            else:
+                self.fragment_reruns += 1
+            self.figure_cache = figure_cache
+            for record in stages:
+                total = self.totals.setdefault(record["stage"], {"seconds": 0.0, "count": 0, "rows": 0, "bytes": None})
+                total["seconds"] += record["seconds"]
+                total["count"] += 1
+                total["rows"] = record["rows"] or 0
+                if record["bytes"] is not None:
+                    total["bytes"] = record["bytes"]
+            return self.prometheus_text()
+
+    def prometheus_text(self) -> str:
+        lines = [
+            "# HELP dashboard_reruns_total Completed dashboard reruns.",
+            "# TYPE dashboard_reruns_total counter",
+            f"dashboard_reruns_total {self.reruns}",
+            "# HELP dashboard_fragment_reruns_total Completed fragment-only reruns.",
+            "# TYPE dashboard_fragment_reruns_total counter",
+            f"dashboard_fragment_reruns_total {self.fragment_reruns}",
+            "# HELP dashboard_stage_seconds Wall time spent per stage.",
+            "# TYPE dashboard_stage_seconds summary",
+        ]
+        for name, total in sorted(self.totals.items()):
+            lines.append(f'dashboard_stage_seconds_sum{{stage="{name}"}} {total["seconds"]:.6f}')
+            lines.append(f'dashboard_stage_seconds_count{{stage="{name}"}} {total["count"]}')
+        lines += ["# HELP dashboard_stage_rows Rows processed by the last run of a stage.",
+                  "# TYPE dashboard_stage_rows gauge"]
+        lines += [f'dashboard_stage_rows{{stage="{name}"}} {total["rows"]}' for name, total in sorted(self.totals.items())]
+        lines += ["# HELP dashboard_stage_payload_bytes Figure JSON bytes of the last measured run of a stage.",
+                  "# TYPE dashboard_stage_payload_bytes gauge"]
+        lines += [f'dashboard_stage_payload_bytes{{stage="{name}"}} {total["bytes"]}'
+                  for name, total in sorted(self.totals.items()) if total["bytes"] is not None]
+        if self.figure_cache is not None:
+            cache = self.figure_cache
+            lines += ["# HELP dashboard_figure_cache_hits_total Figure cache lookups served from the cache.",
+                      "# TYPE dashboard_figure_cache_hits_total counter",
+                      f"dashboard_figure_cache_hits_total {cache['hits']}",
+                      "# HELP dashboard_figure_cache_misses_total Figure cache lookups that built the value.",
+                      "# TYPE dashboard_figure_cache_misses_total counter",
+                      f"dashboard_figure_cache_misses_total {cache['misses']}",
+                      "# HELP dashboard_figure_cache_entries Values held by the figure cache.",
+                      "# TYPE dashboard_figure_cache_entries gauge",
+                      f"dashboard_figure_cache_entries {cache['size']}",
+                      "# HELP dashboard_figure_cache_bytes Estimated bytes held by the figure cache.",
+                      "# TYPE dashboard_figure_cache_bytes gauge",
+                      f"dashboard_figure_cache_bytes {cache['bytes']}"]
+        return "\n".join(lines) + "\n"
+
+
+@st.cache_resource
+def get_metric_store() -> _MetricStore:
+    return _MetricStore()
+
+
+def finish_rerun():
+    """Logs the current rerun and refreshes the Prometheus file; returns the rerun record."""
+    rerun = _current()
+    rerun["finished"] = True
+    rerun["seconds"] = time.time() - rerun["started"]
+    rerun["figure_cache"] = get_figure_cache().stats()
+    store = get_metric_store()
+    text = store.add(rerun["stages"], rerun["figure_cache"], rerun.get("fragment"))
+    try:
+        store.get_logger().info(json.dumps(rerun))
+        tmp_path = LOG_DIR / f"{METRICS_FILE}.{threading.get_ident()}.tmp"
+        tmp_path.write_text(text, encoding="utf-8")
+        tmp_path.replace(LOG_DIR / METRICS_FILE)  # scraper yarım dosya görmesin
+    except OSError:
+        pass  # salt okunur ortamda metrik yazılamıyorsa dashboard çalışmaya devam etsin
+    return rerun
+
+
+def _fragment_only_run() -> bool:
+    # streamlit'in kendisi de bu kuyruğa bakıyor: doluysa script değil sadece parçalar çalışıyor
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx is not None and ctx.script_requests is not None and bool(ctx.script_requests.fragment_id_queue)
+
+
+@contextmanager
+def fragment_run(name):
+    """Own perf record around a fragment body when the fragment reruns alone.
+
+    During a full rerun the fragment's stages simply go into that rerun's
+    record. A record left open by an interrupted full rerun is replaced.
+    """
+    if not _fragment_only_run():
+        yield
+        return
+    start_rerun(fragment=name)
+    try:
+        yield
+    finally:
+        # fragment kenar çubuğuna yazamıyor, tablo parçanın altında çıkıyor
+        render_overlay(finish_rerun(), st.container())
+
+
+def render_overlay(rerun, container=None):
+    """Table of the rerun's stages (in the sidebar by default), shown only with ?perf=1."""
+    if not enabled():
+        return
+    container = st.sidebar if container is None else container
+    title = f"⏱️ Performance ({rerun['fragment']} rerun)" if rerun.get("fragment") else "⏱️ Performance (this rerun)"
+    with container.expander(title, expanded=rerun.get("fragment") is None):
+        st.caption(f"Total: {rerun['seconds'] * 1000:,.0f} ms")
+        cache = rerun.get("figure_cache")
+        if cache:
+            st.caption(f"Figure cache: {cache['hits']:,} hits, {cache['misses']:,} misses, "
+                       f"{cache['size']} entries, {cache['bytes'] / 2**20:,.1f} / {cache['max_bytes'] / 2**20:,.0f} MB")
+        st.dataframe(
+            [{"stage": r["stage"], "ms": round(r["seconds"] * 1000, 1), "rows": r["rows"],
+              "KB": round(r["bytes"] / 1024, 1) if r["bytes"] is not None else None}
+             for r in rerun["stages"]],
+            hide_index=True, use_container_width=True,
+        )
+
+
+def render_memory_report(report):
+    """Sidebar table of the loaded frame's per-column memory, shown only with ?perf=1."""
+    if not enabled() or not report:
+        return
+    before = sum(r["bytes_before"] for r in report)
+    after = sum(r["bytes_after"] for r in report)
+    with st.sidebar.expander("🧮 Memory (loaded data)", expanded=False):
+        st.caption(f"{before / 2**20:,.1f} MB → {after / 2**20:,.1f} MB")
+        st.dataframe(
+            [{"column": r["column"], "dtype": f"{r['dtype_before']} → {r['dtype_after']}",
+              "KB before": round(r["bytes_before"] / 1024, 1), "KB after": round(r["bytes_after"] / 1024, 1)}
+             for r in report],
+            hide_index=True, use_container_width=True,
+        )
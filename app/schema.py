@@ -0,0 +1,167 @@
+"""Codes and display labels of the encoded Telco columns.
+
+The preprocess notebook encodes every categorical with LabelEncoder, so the
+code of a value is its position in the alphabetically sorted raw values. Each
+column below lists its labels in code order: code `i` decodes to `labels[i]`.
+"""
+import numpy as np
+import pandas as pd
+
+YES_NO = ("No", "Yes")
+INTERNET_ADDON = ("No", "No internet service", "Yes")
+
+CATEGORICAL_COLUMNS = {
+    "gender": ("Female", "Male"),
+    "SeniorCitizen": YES_NO,
+    "Partner": YES_NO,
+    "Dependents": YES_NO,
+    "PhoneService": YES_NO,
+    "MultipleLines": ("No", "No phone service", "Yes"),
+    "InternetService": ("DSL", "Fiber optic", "No Service"),
+    "OnlineSecurity": INTERNET_ADDON,
+    "OnlineBackup": INTERNET_ADDON,
+    "DeviceProtection": INTERNET_ADDON,
+    "TechSupport": INTERNET_ADDON,
+    "StreamingTV": INTERNET_ADDON,
+    "StreamingMovies": INTERNET_ADDON,
+    "Contract": ("Month-to-month", "One year", "Two year"),
+    "PaperlessBilling": YES_NO,
+    "PaymentMethod": (
+        "Bank transfer (automatic)",
+        "Credit card (automatic)",
+        "Electronic check",
+        "Mailed check",
+    ),
+    "Churn": YES_NO,
+}
+
+CATEGORY_DTYPES = {col: pd.CategoricalDtype(labels) for col, labels in CATEGORICAL_COLUMNS.items()}
+
+NUMERIC_COLUMNS = ("tenure", "MonthlyCharges", "TotalCharges")
+
+TARGET_COLUMN = "Churn"
+# modelin eğitildiği sırayla girdi kolonları (processed dosyası, Churn hariç)
+FEATURE_COLUMNS = [
+    "gender", "SeniorCitizen", "Partner", "Dependents", "tenure", "PhoneService", "MultipleLines",
+    "InternetService", "OnlineSecurity", "OnlineBackup", "DeviceProtection", "TechSupport",
+    "StreamingTV", "StreamingMovies", "Contract", "PaperlessBilling", "PaymentMethod",
+    "MonthlyCharges", "TotalCharges",
+]
+
+
+def decode_column(values: pd.Series, col: str) -> pd.Categorical:
+    """Turns the integer codes of `col` into a Categorical without copying them.
+
+    Codes outside the declared range become NaN. Columns that already hold
+    labels (older CSV exports) are converted with astype instead.
+    """
+    dtype = CATEGORY_DTYPES[col]
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        if values.dtype == dtype:
+            return values.array
+        return values.astype(str).astype(dtype).array
+
+    if not pd.api.types.is_numeric_dtype(values):
+        return values.astype(dtype).array
+
+    codes = values.to_numpy()
+    n_labels = len(dtype.categories)
+    if pd.api.types.is_integer_dtype(codes):
+        invalid = (codes < 0) | (codes >= n_labels)
+    else:
+        invalid = ~np.isfinite(codes) | (codes < 0) | (codes >= n_labels) | (codes % 1 != 0)
+    if invalid.any() or not pd.api.types.is_integer_dtype(codes):
+        codes = np.where(invalid, -1, np.nan_to_num(codes, nan=-1)).astype(np.int8)
+
+    return pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+
+
+def decode_frame(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """Decodes the schema columns of df in place and returns it."""
+    columns = CATEGORICAL_COLUMNS if columns is None else columns
+    for col in columns:
+        if col in df.columns and df[col].dtype != CATEGORY_DTYPES[col]:
+            df[col] = decode_column(df[col], col)
+    return df
+
+
+def is_decoded(df: pd.DataFrame, columns=None) -> bool:
+    """Whether every schema column of df already holds its Categorical labels."""
+    columns = CATEGORICAL_COLUMNS if columns is None else columns
+    return all(df[col].dtype == CATEGORY_DTYPES[col] for col in columns if col in df.columns)
+
+
+def numeric_view(df: pd.DataFrame, columns=NUMERIC_COLUMNS) -> pd.DataFrame:
+    """Returns df with columns as numbers, without copying or mutating it.
+
+    df itself comes back when the columns are already numeric (the usual
+    case); otherwise a shallow copy gets the converted columns.
+    """
+    pending = [col for col in columns if col in df.columns and not pd.api.types.is_numeric_dtype(df[col])]
+    if not pending:
+        return df
+    df = df.copy(deep=False)
+    for col in pending:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def category_lookup(values: pd.Series, mapping: dict, default=np.nan) -> np.ndarray:
+    """Maps the labels of values through mapping as a float array.
+
+    Categorical columns are mapped with one lookup per category and a take on
+    the codes, so nothing is evaluated per row. Missing labels get default.
+    """
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.map(mapping).fillna(default).to_numpy(dtype=float, copy=True)  # çağıran yerinde değiştirebilsin
+    table = np.array([mapping.get(label, default) for label in values.cat.categories] + [default], dtype=float)
+    return table[values.cat.codes.to_numpy()]
+
+
+# float32'ye inerken izin verilen en büyük mutlak hata (ücretler kuruş, olasılıklar 1e-6)
+FLOAT32_TOLERANCE = {"MonthlyCharges": 0.005, "TotalCharges": 0.005, "churn_probability": 1e-6}
+
+
+def column_memory(df: pd.DataFrame) -> dict:
+    """Column -> (dtype, bytes) of df as it is now."""
+    return {col: (str(df[col].dtype), int(df[col].memory_usage(index=False, deep=True))) for col in df.columns}
+
+
+def compact_dtypes(df: pd.DataFrame, float32=False, before=None) -> list:
+    """Downcasts the columns of df in place to the smallest safe dtypes.
+
+    Integer columns get the smallest integer type holding their min and max,
+    object columns of schema categoricals become Categoricals (int8 codes),
+    and with float32=True the FLOAT32_TOLERANCE columns become float32 when
+    no finite value moves by more than their tolerance. Returns one report
+    row per column with the dtypes and bytes before and after. `before`
+    (from column_memory) gives the starting point of columns that were
+    already converted, e.g. by decode_frame after reading.
+    """
+    before = before or {}
+    report = []
+    for col in df.columns:
+        values = df[col]
+        before_dtype, before_bytes = before.get(col) or (str(values.dtype), int(values.memory_usage(index=False, deep=True)))
+
+        if col in CATEGORY_DTYPES and values.dtype == object:
+            df[col] = decode_column(values, col)
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            # to_numeric sadece min/max'ı tutan tipe iniyor, taşma olmuyor
+            df[col] = pd.to_numeric(values, downcast="integer")
+        elif float32 and col in FLOAT32_TOLERANCE and values.dtype == np.float64:
+            converted = values.to_numpy(dtype=np.float32)
+            finite = np.isfinite(values.to_numpy())
+            error = np.abs(converted[finite].astype(np.float64) - values.to_numpy()[finite])
+            if np.isfinite(converted[finite]).all() and (error.max(initial=0.0) <= FLOAT32_TOLERANCE[col]):
+                df[col] = converted
+
+        report.append({
+            "column": col,
+            "dtype_before": before_dtype,
+            "dtype_after": str(df[col].dtype),
+            "bytes_before": before_bytes,
+            "bytes_after": int(df[col].memory_usage(index=False, deep=True)),
+        })
+    return report
@@ -0,0 +1,63 @@
+"""K-Means customer segments for the Z tab.
+
+Clusters are renumbered by their mean churn probability (Cluster 0 is the
+lowest risk), so the same segment keeps its label across reruns, filter
+changes and warm-started refits. A refit starts from the previous centers
+only when the filtered rows overlap the previous fit's rows by at least
+WARM_START_OVERLAP (Jaccard index of the two row sets).
+"""
+import numpy as np
+
+CLUSTER_COLS = ["tenure", "MonthlyCharges", "TotalCharges", "churn_probability"]
+N_CLUSTERS = 4
+
+# bu satır sayısının üstünde MiniBatchKMeans kullanılıyor
+MINIBATCH_ROWS = 100_000
+# önceki fit'in satırlarıyla en az bu oranda örtüşen filtrede merkezlerden devam ediliyor
+WARM_START_OVERLAP = 0.8
+
+
+def row_mask(index) -> np.ndarray:
+    """Packed bitmap of the (integer) row labels; an eighth of a byte per base row."""
+    labels = np.asarray(index, dtype=np.int64)
+    mask = np.zeros(labels.max() + 1 if len(labels) else 0, dtype=bool)
+    mask[labels] = True
+    return np.packbits(mask)
+
+
+def row_overlap(a, b) -> float:
+    """Jaccard index of two packed row bitmaps."""
+    size = max(len(a), len(b))
+    a, b = np.pad(a, (0, size - len(a))), np.pad(b, (0, size - len(b)))
+    union = int(np.unpackbits(a | b).sum())
+    return int(np.unpackbits(a & b).sum()) / union if union else 0.0
+
+
+def can_warm_start(previous, rows, n_clusters=N_CLUSTERS):
+    """Whether a previous fit ({"centers", "rows"}) covers nearly the same rows (packed bitmap)."""
+    if not previous or len(previous["centers"]) != n_clusters:
+        return False
+    return row_overlap(previous["rows"], rows) >= WARM_START_OVERLAP
+
+
+def fit_segments(X, n_clusters=N_CLUSTERS, init_centers=None, minibatch_rows=MINIBATCH_ROWS):
+    """Clusters the rows of X and returns (labels, centers) in canonical order."""
+    from sklearn.cluster import KMeans, MiniBatchKMeans  # sklearn ilk segmentasyonda yükleniyor
+
+    warm = init_centers is not None
+    init = np.asarray(init_centers, dtype=float) if warm else "k-means++"
+
+    if len(X) > minibatch_rows:
+        model = MiniBatchKMeans(n_clusters=n_clusters, init=init, n_init=1 if warm else 3,
+                                batch_size=4096, random_state=42)
+    else:
+        model = KMeans(n_clusters=n_clusters, init=init, n_init=1 if warm else 10, random_state=42)
+
+    labels = model.fit_predict(X)
+
+    # risk merkezine göre sıralayıp etiketleri yeniden numaralandırıyoruz
+    risk = model.cluster_centers_[:, CLUSTER_COLS.index("churn_probability")]
+    order = np.argsort(risk, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return rank[labels], model.cluster_centers_[order]
@@ -0,0 +1,58 @@
+"""Vectorized retention, hazard and Kaplan-Meier curves.
+
+All groups are computed together from two histograms, customers and churners
+per (group, tenure month), built with a single bincount each. The curves are
+then cumulative sums over the month axis, so the cost no longer depends on
+groups x months x rows.
+"""
+import numpy as np
+import pandas as pd
+
+METHODS = ("retention", "hazard", "kaplan_meier")
+
+
+def tenure_histograms(tenure, churned, group_codes, n_groups, max_tenure):
+    """Counts customers and churners for every (group, tenure month) cell."""
+    n_months = max_tenure + 1
+    cells = group_codes.astype(np.intp) * n_months + np.clip(tenure, 0, max_tenure).astype(np.intp)
+    size = n_groups * n_months
+
+    counts = np.bincount(cells, minlength=size).reshape(n_groups, n_months)
+    events = np.bincount(cells, weights=churned, minlength=size).reshape(n_groups, n_months)
+    return counts, events
+
+
+def curves_from_histograms(counts, events, method="retention"):
+    """Turns (group, month) histograms into percentage curves for months 1..max_tenure."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown survival method: {method}")
+
+    totals = counts.sum(axis=1, keepdims=True)
+    left_by = np.cumsum(counts, axis=1)  # tenure <= t
+    at_risk = totals - np.concatenate([np.zeros_like(totals), left_by[:, :-1]], axis=1)  # tenure >= t
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "retention":
+            curves = (totals - left_by) / totals
+        else:
+            hazard = np.where(at_risk > 0, events / at_risk, 0.0)
+            curves = hazard if method == "hazard" else np.cumprod(1.0 - hazard, axis=1)
+
+    return curves[:, 1:] * 100
+
+
+def survival_curves(df, group_col, method="retention"):
+    """Returns (groups, x_axis, curves) for every group of group_col in order of appearance."""
+    tenure = pd.to_numeric(df["tenure"], errors="coerce").to_numpy()
+    group_codes, groups = pd.factorize(df[group_col])
+    churned = df["Churn"].isin(["Yes", "1"]).to_numpy()
+
+    valid = ~np.isnan(tenure) & (group_codes >= 0)
+    max_tenure = int(tenure[valid].max()) if valid.any() else 0
+    x_axis = np.arange(1, max_tenure + 1)
+
+    counts, events = tenure_histograms(tenure[valid], churned[valid], group_codes[valid], len(groups), max_tenure)
+    curves = curves_from_histograms(counts, events, method)
+
+    present = counts.sum(axis=1) > 0
+    return [g for g, keep in zip(groups, present) if keep], x_axis, curves[present]
@@ -0,0 +1,206 @@
+"""What-if scoring of the filtered customers with the trained churn model.
+
+A scenario is a set of hypothetical changes (e.g. everyone on a one-year
+contract, TechSupport for every internet customer) applied to the coded
+model features. The filtered customers are rescored in batches with
+predict_proba, once as they are and once under the scenario, on a
+background thread: the panel polls the job's progress instead of blocking
+the rerun. Finished jobs are kept per (filter state, scenario) so going
+back to a scenario is instant.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from data_store import MODEL_PATH
+from perf import plotly_chart, stage
+from schema import CATEGORY_DTYPES, FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+BATCH_ROWS = 50_000
+MAX_JOBS = 32
+NO_INTERNET = "No internet service"
+
+logger = logging.getLogger("dashboard.whatif")
+
+# senaryo adı -> {kolon: yeni etiket}; internet eklentileri internet hizmeti olmayanlara uygulanmıyor
+SCENARIOS = {
+    "One-year contract": {"Contract": "One year"},
+    "Two-year contract": {"Contract": "Two year"},
+    "Add TechSupport": {"TechSupport": "Yes"},
+    "Add OnlineSecurity": {"OnlineSecurity": "Yes"},
+    "Automatic payment (credit card)": {"PaymentMethod": "Credit card (automatic)"},
+    "Paperless billing off": {"PaperlessBilling": "No"},
+}
+
+
+@st.cache_resource
+def load_model(path, mtime):
+    """The trained model, loaded once per process (and again when the file changes)."""
+    import joblib
+
+    return joblib.load(path)
+
+
+def get_model():
+    """(model, version) where version is the file's mtime; (None, None) without a trained model."""
+    if not MODEL_PATH.exists():
+        return None, None
+    version = MODEL_PATH.stat().st_mtime_ns
+    return load_model(str(MODEL_PATH), version), version
+
+
+def encode_features(df: pd.DataFrame) -> pd.DataFrame:
+    """Model input of df: Categorical columns back to their LabelEncoder codes, no row copies."""
+    columns = {}
+    for col in FEATURE_COLUMNS:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[col] = values.cat.codes.to_numpy()
+        elif col in NUMERIC_COLUMNS:
+            columns[col] = pd.to_numeric(values, errors="coerce").fillna(0).to_numpy()
+        else:
+            columns[col] = values.to_numpy()
+    return pd.DataFrame(columns, copy=False)
+
+
+def apply_scenario(features: pd.DataFrame, scenario) -> pd.DataFrame:
+    """Features with the scenario applied; only the changed columns are new arrays."""
+    changed = {}
+    for name in scenario:
+        for col, label in SCENARIOS[name].items():
+            categories = CATEGORY_DTYPES[col].categories
+            codes = features[col].to_numpy()
+            target = np.full_like(codes, categories.get_loc(label))
+            if NO_INTERNET in categories:
+                target = np.where(codes == categories.get_loc(NO_INTERNET), codes, target)
+            changed[col] = target
+    columns = {col: changed.get(col, features[col].to_numpy()) for col in features.columns}
+    return pd.DataFrame(columns, copy=False)
+
+
+def score_batches(model, features: pd.DataFrame, progress=None, batch_rows=BATCH_ROWS):
+    """predict_proba[:, 1] over batches of rows; progress(fraction) after each batch."""
+    probabilities = np.empty(len(features))
+    for start in range(0, len(features), batch_rows):
+        stop = min(start + batch_rows, len(features))
+        probabilities[start:stop] = model.predict_proba(features.iloc[start:stop])[:, 1]
+        if progress is not None:
+            progress(stop / len(features))
+    return probabilities
+
+
+class WhatIfJobs:
+    """Process-wide registry of scoring jobs (bounded LRU of finished results)."""
+
+    def __init__(self, maxsize=MAX_JOBS):
+        self.maxsize = maxsize
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_start(self, key, model, df, scenario):
+        with self._lock:
+            if key in self._jobs:
+                self._jobs.move_to_end(key)
+                return self._jobs[key]
+            job = {"progress": 0.0, "result": None, "error": None, "started": time.time()}
+            self._jobs[key] = job
+            while len(self._jobs) > self.maxsize:
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(target=self._run, args=(job, model, df, scenario), daemon=True)
+        thread.start()
+        return job
+
+    @staticmethod
+    def _run(job, model, df, scenario):
+        try:
+            features = encode_features(df)
+            # önce mevcut durum, sonra senaryo: ilerleme ikisinin toplamı üzerinden
+            baseline = score_batches(model, features, lambda f: job.update(progress=f / 2))
+            changed = score_batches(model, apply_scenario(features, scenario), lambda f: job.update(progress=0.5 + f / 2))
+            job["result"] = {"baseline": baseline, "scenario": changed, "seconds": time.time() - job["started"]}
+        except Exception as e:
+            # arka plan iş parçacığı: hata panelde gösteriliyor, traceback log'a yazılıyor
+            logger.exception("what-if scoring failed")
+            job["error"] = str(e)
+        job["progress"] = 1.0
+
+
+@st.cache_resource
+def get_jobs() -> WhatIfJobs:
+    return WhatIfJobs()
+
+
+def build_whatif_figure(result):
+    fig = go.Figure()
+    fig.add_trace(go.Histogram(x=result["baseline"], name="Current", opacity=0.6,
+                               xbins=dict(start=0, end=1, size=0.05), marker_color="#FF0055"))
+    fig.add_trace(go.Histogram(x=result["scenario"], name="Scenario", opacity=0.6,
+                               xbins=dict(start=0, end=1, size=0.05), marker_color="#00F2EA"))
+    fig.update_layout(
+        barmode="overlay",
+        plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color="white"),
+        xaxis=dict(title="Churn Probability", tickformat=".0%"),
+        yaxis=dict(title="Customers", showgrid=True, gridcolor='#333'),
+        legend=dict(orientation="h", y=1.1),
+        height=350,
+    )
+    return fig
+
+
+def show_result(result, n_customers):
+    baseline, changed = result["baseline"], result["scenario"]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("Avg. Risk (Current)", f"{baseline.mean():.1%}")
+    c2.metric("Avg. Risk (Scenario)", f"{changed.mean():.1%}", delta=f"{(changed.mean() - baseline.mean()) * 100:+.1f} pts",
+              delta_color="inverse")
+    c3.metric("Expected Churners Saved", f"{(baseline - changed).sum():,.0f}")
+    st.caption(f"{n_customers:,} customers rescored in {result['seconds']:.1f} s")
+    plotly_chart(build_whatif_figure(result), use_container_width=True)
+
+
+@st.fragment(run_every=1.0)
+def _poll(job, n_customers):
+    # iş bitene kadar sadece bu parça saniyede bir yenileniyor, sayfanın geri kalanı beklemiyor
+    if job["result"] is None and job["error"] is None:
+        st.progress(job["progress"], text=f"Rescoring {n_customers:,} customers... {job['progress']:.0%}")
+    else:
+        st.rerun()  # bitti: sonucu normal akışta göster, yoklama dursun
+
+
+def render_whatif_panel(df: pd.DataFrame, fingerprint=None):
+    """What-if section of the Z tab; df is the filtered processed frame (all model features)."""
+    st.markdown("#### 4. What-If Simulator (Live Rescoring)")
+    st.caption("Apply hypothetical changes to the filtered customers and rescore them with the trained model.")
+
+    model, model_version = get_model()
+    if model is None:
+        st.info("Trained model not found (models/churn_model.joblib). Run the train stage first.")
+        return
+    if df is None or df.empty or not all(c in df.columns for c in FEATURE_COLUMNS):
+        st.info("Not enough data for what-if scoring.")
+        return
+
+    scenario = tuple(sorted(st.multiselect("Hypothetical changes:", list(SCENARIOS), key="whatif_scenario")))
+    if not scenario:
+        st.info("Select at least one change to simulate.")
+        return
+
+    if fingerprint is None:
+        fingerprint = int(pd.util.hash_pandas_object(df.index, index=False).sum())
+    with stage("z.whatif", rows=len(df)):
+        # model yeniden eğitildiyse eski modelin sonucu kullanılmasın
+        job = get_jobs().get_or_start((fingerprint, scenario, model_version), model, df, scenario)
+    if job["error"] is not None:
+        st.error(f"What-if scoring failed: {job['error']}")
+    elif job["result"] is not None:
+        show_result(job["result"], len(df))
+    else:
+        _poll(job, len(df))
@@ -0,0 +1,142 @@
+"""Cold-start budget: how fast a fresh Streamlit worker gets to its first paint.
+
+Every measurement runs in a new interpreter, as on a freshly scaled-out
+container:
+
+- startup imports: the modules app/app.py imports at the top (read from its
+  source). None of the chart modules or the heavy dependencies only they
+  need (HEAVY_MODULES) may be loaded by them, beyond what a bare
+  `import streamlit` already loads (Streamlit itself imports
+  plotly.graph_objects, so plotly as such is not checked);
+- lazy imports: the cost of each chart module, paid on its first use;
+- first paint: a full AppTest run of app/app.py (default section) from
+  process start.
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --budget-scale 2   # slower machine
+
+Exits with status 1 when a budget is exceeded, a heavy module is loaded
+at startup or a measuring process fails.
+"""
+import argparse
+import ast
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# sadece uygulamanın kontrol ettikleri: plotly.graph_objects'i streamlit zaten yüklüyor
+HEAVY_MODULES = ["plotly.express", "sklearn", "scipy", "joblib"]
+
+# saniye; --budget-scale ile makineye göre ölçekleniyor
+BUDGETS = {
+    "startup_imports": 3.0,
+    "first_paint": 15.0,
+}
+
+IMPORT_PROBE = """
+import json, sys, time
+sys.path.insert(0, {app_dir!r})
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+# ertelenen modül aynı süreçte, başlangıç modülleri yüklendikten sonra ölçülüyor
+start = time.perf_counter()
+for name in {lazy!r}:
+    __import__(name)
+lazy_seconds = time.perf_counter() - start
+heavy = {{h for m in sys.modules for h in {heavy!r} if m == h or m.startswith(h + ".")}}
+print(json.dumps({{"seconds": seconds, "lazy_seconds": lazy_seconds, "heavy": sorted(heavy)}}))
+"""
+
+PAINT_PROBE = """
+import json, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({app_path!r}, default_timeout=600)
+app.run()
+print(json.dumps({{"seconds": time.perf_counter() - start, "errors": [e.value for e in app.exception]}}))
+"""
+
+
+def app_imports(app_path=APP_DIR / "app.py"):
+    """(top-level imports of app.py, chart modules of its CHART_MODULES), read from the source."""
+    tree = ast.parse(Path(app_path).read_text(encoding="utf-8"))
+    startup, lazy = [], []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            startup += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            startup.append(node.module)
+        elif isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "CHART_MODULES" for t in node.targets):
+            lazy = [module for module, _ in ast.literal_eval(node.value).values()]
+    return list(dict.fromkeys(startup)), lazy
+
+
+STARTUP_MODULES, LAZY_MODULES = app_imports()
+
+
+def run_probe(code) -> dict:
+    """Runs code in a fresh interpreter; raises CalledProcessError when it fails."""
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=APP_DIR, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_probe(modules, lazy=()) -> dict:
+    return run_probe(IMPORT_PROBE.format(app_dir=str(APP_DIR), modules=modules, lazy=list(lazy),
+                                         heavy=HEAVY_MODULES + LAZY_MODULES))
+
+
+def measure() -> dict:
+    baseline = import_probe(["streamlit"])
+    startup = import_probe(STARTUP_MODULES)
+    # streamlit'in kendi yüklediklerini uygulamaya yazmıyoruz
+    startup["heavy"] = sorted(set(startup["heavy"]) - set(baseline["heavy"]))
+    lazy = {}
+    for name in LAZY_MODULES:
+        # modülün kendi maliyeti: başlangıç modülleri zaten yüklüyken ek süre
+        lazy[name] = import_probe(STARTUP_MODULES, [name])["lazy_seconds"]
+    paint = run_probe(PAINT_PROBE.format(app_path=str(APP_DIR / "app.py")))
+    return {"startup": startup, "lazy": lazy, "first_paint": paint}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-scale", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="print the raw measurements as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        results = measure()
+    except subprocess.CalledProcessError as e:
+        # ölçüm süreci çöktüyse bütçe sonucu yok: hatayı gösterip başarısız çıkıyoruz
+        print(f"FAIL probe exited with status {e.returncode}")
+        print(e.stderr.strip()[-2000:])
+        return 1
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    failed = False
+    checks = {"startup_imports": results["startup"]["seconds"], "first_paint": results["first_paint"]["seconds"]}
+    for name, seconds in checks.items():
+        budget = BUDGETS[name] * args.budget_scale
+        ok = seconds <= budget
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<16} {seconds:6.2f} s (budget {budget:.2f} s)")
+    for name, seconds in results["lazy"].items():
+        print(f"     lazy {name:<16} {seconds:6.2f} s (paid on first use)")
+
+    if results["startup"]["heavy"]:
+        failed = True
+        print(f"FAIL heavy modules loaded at startup: {', '.join(results['startup']['heavy'])}")
+    for error in results["first_paint"]["errors"]:
+        failed = True
+        print(f"FAIL app error on first paint: {error}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
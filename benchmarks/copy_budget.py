@@ -0,0 +1,83 @@
+"""Peak-memory budget for the data paths of the chart modules.
+
+Each check runs one data-preparation step of the chart modules on the
+processed dataset under tracemalloc and compares the peak allocation with
+the in-memory size of the frame. A step that copies the whole frame peaks
+at 1x or more, so the budgets below fail as soon as a full copy creeps back
+in. Figure construction itself (Plotly trace arrays) is not measured.
+
+    python benchmarks/copy_budget.py
+    python benchmarks/copy_budget.py --data-dir /path/to/processed
+
+Exits with status 1 when a step goes over its budget.
+"""
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from charts_arsen import strip_positions
+from charts_isil import risk_rows
+from charts_mehmet import map_categorical_values
+from data_store import DATA_DIR, PROBS_COLUMNS, PROBS_NAME, PROCESSED_NAME, attach_probabilities, read_table
+from schema import decode_frame, numeric_view
+
+# adım başına izin verilen tepe bellek, frame boyutunun katı olarak
+BUDGETS = {
+    "map_categorical_values": 0.05,
+    "numeric_view": 0.05,
+    "risk_rows": 0.05,
+    # dar frame iki yeni float64 kolon (x_pos, x_jittered) ve bir geçici lookup dizisi kadar
+    "strip_positions": 0.55,
+}
+
+
+def peak_ratio(step, frame_bytes):
+    """Peak bytes allocated while running step(), relative to frame_bytes."""
+    tracemalloc.start()
+    try:
+        step()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / frame_bytes
+
+
+def run_checks(df):
+    frame_bytes = df.memory_usage(deep=True).sum()
+
+    steps = {
+        "map_categorical_values": (lambda: map_categorical_values(df), frame_bytes),
+        "numeric_view": (lambda: numeric_view(df), frame_bytes),
+        "risk_rows": (lambda: risk_rows(df), frame_bytes),
+        "strip_positions": (lambda: strip_positions(df), frame_bytes),
+    }
+    return {name: peak_ratio(step, size) for name, (step, size) in steps.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    df = read_table(PROCESSED_NAME, data_dir=args.data_dir)
+    df_probs = read_table(PROBS_NAME, columns=PROBS_COLUMNS, data_dir=args.data_dir)
+    if df is None or df_probs is None:
+        print(f"processed data not found in {args.data_dir}")
+        return 1
+    decode_frame(df)
+    attach_probabilities(df, df_probs)
+
+    failed = False
+    for name, ratio in run_checks(df).items():
+        ok = ratio <= BUDGETS[name]
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<24} peak {ratio:5.2f}x frame (budget {BUDGETS[name]:.2f}x)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Headless benchmark of the dashboard on synthetic data of increasing size.
+
+For every row count the synthetic tables are generated once (cached under
+benchmarks/data/<rows>) and a child process times, through Streamlit's
+AppTest:
+
+- the data steps: load_data (read + decode), attach_probabilities, build_filter_index,
+  build_column_profile, filter_dataframe (resolve_filters) and calculate_retention;
+- render_x_charts, render_y_charts and render_z_charts on the filtered
+  frame, without the figure cache;
+- a cold and a warm full run of app/app.py.
+
+Each size runs in its own process so caches and peak RSS do not leak from
+one size to the next. Results are written as JSON to benchmarks/results/,
+and two result files can be compared to spot regressions between commits.
+Exits with status 1 when the process of any size fails:
+
+    python benchmarks/run.py --sizes 10000 100000
+    python benchmarks/run.py --compare results/old.json results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+APP_DIR = BENCH_DIR.parent / "app"
+RESULTS_DIR = BENCH_DIR / "results"
+SYNTHETIC_DIR = BENCH_DIR / "data"
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+APP_TIMEOUT = 3600
+# --compare bu oranın üstündeki yavaşlamaları işaretliyor
+REGRESSION_RATIO = 1.2
+
+
+def steps_script():
+    """AppTest script: times the data steps and the three render functions."""
+    import json
+    import os
+    import sys
+    import time
+
+    sys.path.insert(0, os.environ["BENCH_APP_DIR"])
+
+    from charts_arsen import render_y_charts
+    from charts_isil import render_z_charts
+    from charts_mehmet import calculate_retention, map_categorical_values, render_x_charts
+    from column_profile import build_column_profile
+    from data_store import PROBS_COLUMNS, PROBS_NAME, PROCESSED_NAME, attach_probabilities, read_table
+    from filter_index import build_filter_index, resolve_filters
+    from schema import decode_frame
+
+    timings = {}
+
+    def timed(name, build):
+        start = time.perf_counter()
+        result = build()
+        timings[name] = time.perf_counter() - start
+        return result
+
+    df = timed("load_data", lambda: decode_frame(read_table(PROCESSED_NAME)))
+    timed("attach_probabilities", lambda: attach_probabilities(df, read_table(PROBS_NAME, columns=PROBS_COLUMNS)))
+    index = timed("build_filter_index", lambda: build_filter_index(df))
+    timed("build_column_profile", lambda: build_column_profile(df))
+
+    # tipik bir filtre durumu: iki sözleşme tipi ve tenure aralığı
+    selections = {"Contract": ["Month-to-month", "One year"]}
+    ranges = {"tenure": (6, 60)}
+    mask = timed("filter_dataframe", lambda: resolve_filters(index, selections, ranges))
+    df_filtered = df[mask]
+
+    timed("calculate_retention", lambda: calculate_retention(map_categorical_values(df_filtered), "InternetService"))
+    timed("render_x_charts", lambda: render_x_charts(df_filtered))
+    timed("render_y_charts", lambda: render_y_charts(df_filtered))
+    timed("render_z_charts", lambda: render_z_charts(df_filtered))
+
+    with open(os.environ["BENCH_OUT"], "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "filtered_rows": int(mask.sum()), "timings": timings}, f)
+
+
+def _apptest_errors(at):
+    return [str(e.value) for e in at.exception]
+
+
+def run_size(data_dir) -> dict:
+    """Child-process entry point: benchmarks the tables in data_dir (TELCO_DATA_DIR)."""
+    import tempfile
+
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    os.environ["TELCO_DATA_DIR"] = str(data_dir)
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = Path(tmp) / "steps.json"
+        os.environ["BENCH_APP_DIR"] = str(APP_DIR)
+        os.environ["BENCH_OUT"] = str(out_path)
+
+        at = AppTest.from_function(steps_script, default_timeout=APP_TIMEOUT)
+        at.run()
+        errors = _apptest_errors(at)
+        result = json.loads(out_path.read_text(encoding="utf-8")) if out_path.exists() else {"timings": {}}
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    app = AppTest.from_file(str(APP_DIR / "app.py"), default_timeout=APP_TIMEOUT)
+    for name in ("app_cold_run", "app_warm_run"):
+        start = time.perf_counter()
+        app.run()
+        result["timings"][name] = time.perf_counter() - start
+    # sadece seçili sekme hesaplanıyor: her sekmeye ilk geçiş ve ilk sekmeye cache'ten dönüş
+    tabs = app.radio(key="active_tab").options
+    for i, label in enumerate(tabs[1:] + tabs[:1], start=1):
+        start = time.perf_counter()
+        app.radio(key="active_tab").set_value(label).run()
+        result["timings"][f"app_tab_{i}" if i < len(tabs) else "app_tab_back"] = time.perf_counter() - start
+    errors += _apptest_errors(app)
+
+    result["errors"] = errors
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def ensure_synthetic(n_rows) -> Path:
+    from synthetic import write_synthetic
+
+    out_dir = SYNTHETIC_DIR / str(n_rows)
+    if not (out_dir / "telco_churn_with_probs.parquet").exists() and not (out_dir / "telco_churn_with_probs.csv").exists():
+        try:
+            write_synthetic(n_rows, out_dir, ("parquet",))
+        except ImportError:
+            write_synthetic(n_rows, out_dir, ("csv",))
+    return out_dir
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_all(sizes) -> dict:
+    results = {
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "sizes": {},
+    }
+    for n_rows in sizes:
+        data_dir = ensure_synthetic(n_rows)
+        env = dict(os.environ, TELCO_DATA_DIR=str(data_dir))
+        child = subprocess.run([sys.executable, __file__, "--child", str(data_dir)], env=env,
+                               capture_output=True, text=True)
+        if child.returncode != 0:
+            # çöken boyut sonuç dosyasında kalıyor ama çalıştırma başarısız sayılıyor
+            results["sizes"][str(n_rows)] = {"errors": [child.stderr.strip()[-2000:]], "timings": {},
+                                             "returncode": child.returncode}
+            results["failed"] = True
+        else:
+            results["sizes"][str(n_rows)] = json.loads(child.stdout.strip().splitlines()[-1])
+        print_size(n_rows, results["sizes"][str(n_rows)])
+    return results
+
+
+def print_size(n_rows, result):
+    print(f"--- {n_rows:,} rows (peak RSS {result.get('peak_rss_mb', 0):,.0f} MB)")
+    if "returncode" in result:
+        print(f"  FAIL: benchmark process exited with status {result['returncode']}")
+    for name, seconds in result["timings"].items():
+        print(f"  {name:<22} {seconds:9.3f} s")
+    for error in result.get("errors", []):
+        print(f"  error: {error}")
+
+
+def compare(old_path, new_path) -> int:
+    """Prints new/old time ratios; returns 1 when a step slowed down more than REGRESSION_RATIO."""
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{old['commit']} -> {new['commit']}")
+
+    regressed = False
+    for size, new_result in new["sizes"].items():
+        old_timings = old["sizes"].get(size, {}).get("timings", {})
+        for name, seconds in new_result["timings"].items():
+            if name not in old_timings or old_timings[name] <= 0:
+                continue
+            ratio = seconds / old_timings[name]
+            flag = "  <-- slower" if ratio > REGRESSION_RATIO else ""
+            regressed |= bool(flag)
+            print(f"  {int(size):>12,} {name:<22} {old_timings[name]:9.3f} -> {seconds:9.3f} s ({ratio:4.2f}x){flag}")
+    return 1 if regressed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--out", type=Path, help="result file (default: results/<time>-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--child", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_size(args.child)))
+        return 0
+    if args.compare:
+        return compare(*args.compare)
+
+    results = run_all(args.sizes)
+    out_path = args.out or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{results['commit']}.json"
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"results -> {out_path}")
+    return 1 if results.get("failed") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
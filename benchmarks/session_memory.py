@@ -0,0 +1,205 @@
+"""Memory of concurrent dashboard sessions: the dataset must be shared, not copied.
+
+Loads the dataset once per process the way app/app.py's cached loader does
+(read, decode, attach probabilities, downcast, read-only buffers) together
+with the filter index and the cube, as st.cache_resource keeps them. Every
+session does what a rerun does with them: resolves the sidebar filters
+(defaults, then one Contract type deselected) to a row mask and filters the
+frame, slices the cube, computes the KPIs, and runs the data paths of the
+chart modules (decode check, risk rows, strip positions).
+
+Two checks, both deterministic:
+
+- sharing: 1, 2, 4, ... sessions run at the same time, one thread each, and
+  every session's frame must share its column buffers with the loaded one
+  (np.shares_memory) and use the very same filter index bitmaps;
+- working set: one session's rerun, measured alone, may allocate at most
+  SESSION_BUDGET x the dataset size (its filtered rows and derived arrays)
+  plus CUBE_BUDGET x the cube size (its cube slice and the temporaries of
+  slicing it). The median of REPEATS runs is compared.
+
+--copy-per-session gives every session its own pickled copy of the frame
+and the index, as st.cache_data would, to show that both checks fail then.
+
+    python benchmarks/session_memory.py
+    python benchmarks/session_memory.py --sessions 1 4 16 --data-dir benchmarks/data/100000
+
+Exits with status 1 when a session does not share the dataset or the budget
+is exceeded.
+"""
+import argparse
+import gc
+import os
+import pickle
+import statistics
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+SESSIONS = [1, 2, 4, 8, 16]
+# tek oturumun rerun'ında izin verilen tepe bellek: veri seti ve cube boyutunun katları olarak
+SESSION_BUDGET = 0.5
+CUBE_BUDGET = 2.0
+# tek başına ölçülen rerun'ın ortanca tepesi karşılaştırılıyor
+REPEATS = 5
+
+
+def load_shared(float32=None):
+    """The objects the app caches per process: (frozen frame, filter index, cube, dataset bytes, cube bytes)."""
+    import pandas as pd
+
+    from cube import build_cube
+    from data_store import (FLOAT32, PROBS_COLUMNS, PROBS_NAME, PROCESSED_NAME, attach_probabilities,
+                            freeze_frame, read_table)
+    from filter_index import build_filter_index
+    from schema import compact_dtypes, decode_frame
+
+    pd.set_option("mode.copy_on_write", True)  # app.py ile aynı
+    # app.load_data ile aynı adımlar
+    df = read_table(PROCESSED_NAME)
+    if df is None:
+        raise FileNotFoundError(f"{PROCESSED_NAME} not found")
+    decode_frame(df)
+    probs = read_table(PROBS_NAME, columns=PROBS_COLUMNS)
+    if probs is not None:
+        attach_probabilities(df, probs)
+    report = compact_dtypes(df, float32=FLOAT32 if float32 is None else float32)
+    df = freeze_frame(df)
+    cube = build_cube(df)
+    return (df, build_filter_index(df), cube, sum(r["bytes_after"] for r in report),
+            int(cube.memory_usage(deep=True).sum()))
+
+
+def session_objects(shared, copy_per_session=False):
+    """The (frame, filter index) a session gets from the app's cached loaders."""
+    data, index = shared[:2]
+    if copy_per_session:
+        # st.cache_data gibi: her oturuma pickle'dan yeni bir kopya
+        return pickle.loads(pickle.dumps(data)), pickle.loads(pickle.dumps(index))
+    return data, index
+
+
+def filter_states(data):
+    """Default filters (everything selected), then one Contract type deselected."""
+    contracts = list(data["Contract"].cat.categories)
+    tenure = (int(data["tenure"].min()), int(data["tenure"].max()))
+    return [({"Contract": contracts}, {"tenure": tenure}), ({"Contract": contracts[1:]}, {"tenure": tenure})]
+
+
+def session_rerun(data, index, cube, selections, ranges) -> dict:
+    """One session's rerun on the shared objects; returns what the session would hold."""
+    from charts_arsen import strip_positions
+    from charts_isil import risk_rows
+    from charts_mehmet import map_categorical_values
+    from cube import CUBE_FILTER_COLUMNS, slice_cube
+    from filter_index import resolve_filters
+
+    # app.filter_dataframe
+    mask = resolve_filters(index, selections, ranges)
+    view = data if mask is None else data[mask]
+    cube_view = slice_cube(cube, {col: value for col, value in selections.items() if col in CUBE_FILTER_COLUMNS},
+                           {col: value for col, value in ranges.items() if col in CUBE_FILTER_COLUMNS})
+    return {
+        "view": view,
+        "cube": cube_view,
+        "kpis": (len(view), int(view["Churn"].isin(["Yes"]).sum()), view["MonthlyCharges"].mean()),
+        "labels": map_categorical_values(view),
+        "risk": risk_rows(view) if "churn_probability" in view.columns else None,
+        "strip": strip_positions(view),
+    }
+
+
+def _buffer(series):
+    import pandas as pd
+
+    # .cat.codes yeni bir dizi veriyor; Categorical.codes ise kodların kendisine bakıyor
+    return series.array.codes if isinstance(series.dtype, pd.CategoricalDtype) else series.to_numpy()
+
+
+def unshared(shared, frame, index) -> list:
+    """Columns and index bitmaps of a session that are not the loaded objects' own buffers."""
+    import numpy as np
+
+    data, shared_index = shared[:2]
+    missing = [col for col in data.columns if not np.shares_memory(_buffer(frame[col]), _buffer(data[col]))]
+    for col, bitmaps in shared_index["bitmaps"].items():
+        session_bitmaps = index["bitmaps"].get(col, {})
+        if any(session_bitmaps.get(label) is not bitmap for label, bitmap in bitmaps.items()):
+            missing.append(f"bitmaps[{col}]")
+    return missing
+
+
+def run_sessions(shared, n_sessions, copy_per_session=False) -> list:
+    """Runs n_sessions sessions at the same time; returns the unshared buffers of each."""
+    cube = shared[2]
+    states = filter_states(shared[0])
+    all_done = threading.Barrier(n_sessions)
+
+    def session(_):
+        frame, index = session_objects(shared, copy_per_session)
+        for selections, ranges in states:
+            result = session_rerun(frame, index, cube, selections, ranges)
+            all_done.wait()  # rerun'lar aynı anda bitiyor: her oturumun ara sonuçları aynı anda bellekte
+            del result
+        return unshared(shared, frame, index)
+
+    with ThreadPoolExecutor(max_workers=n_sessions) as pool:
+        return list(pool.map(session, range(n_sessions)))
+
+
+def session_peak(shared, copy_per_session=False) -> int:
+    """Peak traced bytes of one session's reruns, measured alone (no other thread allocating)."""
+    cube = shared[2]
+    states = filter_states(shared[0])
+    gc.collect()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    frame, index = session_objects(shared, copy_per_session)
+    for selections, ranges in states:
+        result = None  # oturum bir sonraki rerun'da öncekinin sonuçlarını bırakıyor
+        result = session_rerun(frame, index, cube, selections, ranges)
+    _, peak = tracemalloc.get_traced_memory()
+    del result, frame, index
+    return peak - base
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=SESSIONS)
+    parser.add_argument("--data-dir", type=Path, default=None, help="default: the app's data folder")
+    parser.add_argument("--copy-per-session", action="store_true",
+                        help="give every session its own copy of the dataset (should fail)")
+    args = parser.parse_args(argv)
+    if args.data_dir is not None:
+        os.environ["TELCO_DATA_DIR"] = str(args.data_dir.resolve())
+
+    shared = load_shared()
+    size, cube_size = shared[3:]
+    failed = False
+
+    for n in sorted(args.sessions):
+        unshared_buffers = [buffers for buffers in run_sessions(shared, n, args.copy_per_session) if buffers]
+        failed |= bool(unshared_buffers)
+        detail = f"{len(unshared_buffers)} copied ({', '.join(unshared_buffers[0][:3])}...)" if unshared_buffers else "shared"
+        print(f"{'FAIL' if unshared_buffers else 'ok  '} {n:>3} sessions  dataset and filter index {detail}")
+
+    budget = SESSION_BUDGET * size + CUBE_BUDGET * cube_size
+    tracemalloc.start()
+    session_peak(shared, args.copy_per_session)  # ısınma: ilk çağrıdaki tembel importlar ölçüme girmesin
+    peak = statistics.median(session_peak(shared, args.copy_per_session) for _ in range(REPEATS))
+    tracemalloc.stop()
+    ok = peak <= budget
+    failed |= not ok
+    print(f"{'ok  ' if ok else 'FAIL'} one session's rerun  peak +{peak / 2**20:,.2f} MB ({peak / size:.2f}x dataset; "
+          f"budget {SESSION_BUDGET:.2f}x dataset {size / 2**20:,.1f} MB + {CUBE_BUDGET:.1f}x cube "
+          f"{cube_size / 2**20:,.1f} MB = {budget / 2**20:,.2f} MB)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Synthetic Telco data with the schema of the processed files, at any size.
+
+Rows are bootstrapped from the real `telco_churn_with_probs` table, so the
+joint distribution of the coded categoricals, churn and churn probability
+is the one of the Kaggle sample. The numeric columns are jittered around the
+sampled row (tenure by a few months, MonthlyCharges by a few percent,
+TotalCharges recomputed from both) so large datasets do not consist of exact
+duplicates, and every row gets its own customerID. Both `Telco_processed` and `telco_churn_with_probs` are written,
+row-aligned like the originals, in chunks so 10M rows fit in memory.
+
+    python benchmarks/synthetic.py 10000 100000 1000000 10000000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))
+
+from data_store import (CUSTOMER_KEY, DATA_DIR, PROBS_NAME, PROCESSED_NAME, columnar_writer,
+                        compact_frame, read_table, write_columnar_chunk)
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+CHUNK_ROWS = 1_000_000
+
+MAX_TENURE = 72
+MIN_CHARGE, MAX_CHARGE = 18.0, 120.0
+
+
+def load_seed(data_dir=DATA_DIR) -> pd.DataFrame:
+    """The real probs table (processed columns + churn_probability) to sample from."""
+    seed = read_table(PROBS_NAME, data_dir=data_dir)
+    if seed is None:
+        raise FileNotFoundError(f"{PROBS_NAME} not found in {data_dir}")
+    seed = seed.drop(columns=[CUSTOMER_KEY], errors="ignore")
+    seed = compact_frame(seed.dropna().reset_index(drop=True))
+    seed["TotalCharges"] = pd.to_numeric(seed["TotalCharges"], errors="coerce").fillna(0)
+    return seed
+
+
+def synthetic_chunk(seed: pd.DataFrame, n_rows, rng, first_id=0) -> pd.DataFrame:
+    """n_rows bootstrapped rows of seed with jittered numeric columns and new customer keys."""
+    rows = rng.integers(0, len(seed), size=n_rows)
+    chunk = {CUSTOMER_KEY: np.char.add("SYN-", np.arange(first_id, first_id + n_rows).astype("U10")).astype(object)}
+    chunk.update((col, seed[col].to_numpy()[rows]) for col in seed.columns)
+
+    tenure = chunk["tenure"].astype(np.int16) + rng.integers(-2, 3, size=n_rows).astype(np.int16)
+    tenure = np.clip(tenure, 0, MAX_TENURE)
+    charges = np.clip(chunk["MonthlyCharges"] * rng.lognormal(0.0, 0.03, size=n_rows), MIN_CHARGE, MAX_CHARGE)
+    # toplam ücret ~ aylık ücret x ay; yeni müşterilerde tek aylık ücret
+    total = charges * np.maximum(tenure, 1) * rng.normal(1.0, 0.03, size=n_rows)
+
+    chunk["tenure"] = tenure.astype(seed["tenure"].dtype)
+    chunk["MonthlyCharges"] = charges.round(2)
+    chunk["TotalCharges"] = total.round(2)
+    chunk["churn_probability"] = np.clip(chunk["churn_probability"] + rng.normal(0.0, 0.01, size=n_rows), 0.0, 1.0)
+    return pd.DataFrame(chunk, columns=list(chunk))
+
+
+def write_synthetic(n_rows, out_dir, formats=("parquet",), seed_dir=DATA_DIR, random_state=42,
+                    chunk_rows=CHUNK_ROWS):
+    """Writes n_rows synthetic rows of both processed tables into out_dir."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    seed = load_seed(seed_dir)
+    rng = np.random.default_rng(random_state)
+
+    columns = [CUSTOMER_KEY] + list(seed.columns)
+    tables = {PROBS_NAME: columns, PROCESSED_NAME: [c for c in columns if c != "churn_probability"]}
+    writers = {}
+    try:
+        for start in range(0, n_rows, chunk_rows):
+            chunk = synthetic_chunk(seed, min(chunk_rows, n_rows - start), rng, first_id=start)
+            for name, columns in tables.items():
+                frame = chunk[columns]
+                if "parquet" in formats:
+                    if name not in writers:
+                        writers[name] = columnar_writer(out_dir / f"{name}.parquet", frame, n_rows)
+                    write_columnar_chunk(writers[name], frame)
+                if "csv" in formats:
+                    frame.to_csv(out_dir / f"{name}.csv", mode="w" if start == 0 else "a",
+                                 header=start == 0, index=False)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return out_dir
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", type=int, nargs="+", help=f"row counts, e.g. {' '.join(map(str, SIZES))}")
+    parser.add_argument("--out", type=Path, default=Path(__file__).resolve().parent / "data",
+                        help="output directory (one subdirectory per row count)")
+    parser.add_argument("--format", choices=["parquet", "csv", "both"], default="parquet")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    formats = ("parquet", "csv") if args.format == "both" else (args.format,)
+    for n_rows in args.rows:
+        out_dir = write_synthetic(n_rows, args.out / str(n_rows), formats, random_state=args.seed)
+        print(f"{n_rows:>12,} rows -> {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""Batch jobs of the DVC pipeline (scoring, ...), run as `python -m pipeline.<job>`.
+
+The jobs share the schema and file helpers of the app, so app/ is put on
+the import path here, the same way the app imports its modules by name.
+"""
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
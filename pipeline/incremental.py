@@ -0,0 +1,203 @@
+"""Incremental refresh: re-encodes and re-scores only new or changed customers.
+
+It writes to its own folder, REFRESH_DIR (data/refreshed/), never to the
+files of the preprocess and train stages. Every run leaves a fingerprint
+snapshot (customerID -> hash of the raw feature fields) next to its
+processed files. The next run streams the raw export in chunks and
+compares each row's fingerprint with the snapshot:
+
+- new or changed customers are encoded (pipeline.preprocess.encode_chunk)
+  and scored with the current model;
+- unchanged customers are copied from the previous probabilities table,
+  processed columns and churn_probability included;
+- customers missing from the export are dropped.
+
+The processed and probabilities files are then rewritten in raw order from
+the merged chunks, with the same names and layout as after a full run, so
+the app reads them with TELCO_DATA_DIR=data/refreshed. The
+snapshot also records the model and encodings it was made with; when either
+changed, every customer counts as changed. Rows with a blank TotalCharges
+are always re-encoded because their fill value is the mean of the export.
+
+Only the compact previous probabilities table (integer codes) is held in
+memory, as the dashboard itself holds it; the raw export is streamed.
+
+    python -m pipeline.incremental
+    python -m pipeline.incremental --input new_export.csv --full
+    python -m pipeline.incremental --output-dir /data/refreshed
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pipeline  # noqa: F401  (app/ modüllerini import yoluna ekliyor)
+from data_store import (CUSTOMER_KEY, DATA_DIR, MODEL_PATH, PROBS_NAME, PROCESSED_NAME, columnar_writer,
+                        read_table, write_columnar_chunk)
+from pipeline.preprocess import (CHUNK_ROWS, ENCODINGS_NAME, RAW_PATH, build_encodings, encode_chunk,
+                                 persist_encodings, read_raw, scan_totals)
+from schema import FEATURE_COLUMNS
+
+REFRESH_DIR = DATA_DIR.parent / "refreshed"
+SNAPSHOT_NAME = "fingerprints"
+SNAPSHOT_KEY = b"telco.snapshot"
+
+
+def file_digest(path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def snapshot_state(model_path, encodings) -> dict:
+    """What the fingerprints are only valid for: the model and the encodings."""
+    return {
+        "model": file_digest(model_path),
+        "encodings": hashlib.blake2b(json.dumps(encodings, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest(),
+    }
+
+
+def fingerprints(raw_chunk: pd.DataFrame) -> np.ndarray:
+    """uint64 hash of each raw row's fields except the customer key."""
+    return pd.util.hash_pandas_object(raw_chunk.drop(columns=[CUSTOMER_KEY]), index=False).to_numpy()
+
+
+def load_snapshot(data_dir, state):
+    """Previous fingerprints by customer and probabilities table, (None, None) when unusable."""
+    import pyarrow.parquet as pq
+
+    path = Path(data_dir) / f"{SNAPSHOT_NAME}.parquet"
+    if not path.exists():
+        return None, None
+    metadata = pq.read_schema(path).metadata or {}
+    if json.loads(metadata.get(SNAPSHOT_KEY, b"{}")) != state:
+        print("model or encodings changed since the last snapshot, rescoring everyone")
+        return None, None
+
+    probs = read_table(PROBS_NAME, data_dir=data_dir)
+    if probs is None or CUSTOMER_KEY not in probs.columns:
+        return None, None
+    snapshot = pq.read_table(path).to_pandas()
+    # snapshot ve probs aynı müşteri sırasında yazılıyor, yine de anahtarla eşliyoruz
+    positions = pd.Index(probs[CUSTOMER_KEY]).get_indexer(snapshot[CUSTOMER_KEY])
+    snapshot = snapshot[positions >= 0]
+    previous = {
+        "index": pd.Index(snapshot[CUSTOMER_KEY]),
+        "fingerprint": snapshot["fingerprint"].to_numpy(),
+        "position": positions[positions >= 0],
+    }
+    return previous, probs
+
+
+def snapshot_writer(path, state):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(CUSTOMER_KEY, pa.string()), ("fingerprint", pa.uint64())],
+                       metadata={SNAPSHOT_KEY: json.dumps(state).encode("utf-8")})
+    return pq.ParquetWriter(path, schema, compression="zstd")
+
+
+def refresh(input_path=RAW_PATH, data_dir=REFRESH_DIR, model_path=MODEL_PATH, chunk_rows=CHUNK_ROWS,
+            full=False) -> dict:
+    """Merges the raw export into the processed/probabilities files of data_dir; returns row counts."""
+    import joblib
+    import pyarrow as pa
+
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    encodings = build_encodings()
+    persist_encodings(encodings, data_dir / ENCODINGS_NAME)
+    state = snapshot_state(model_path, encodings)
+    previous, old_probs = (None, None) if full else load_snapshot(data_dir, state)
+    model = joblib.load(model_path)
+    total_charges_mean, _ = scan_totals(input_path, chunk_rows)
+
+    paths = {
+        "processed": data_dir / f"{PROCESSED_NAME}.parquet",
+        "probs": data_dir / f"{PROBS_NAME}.parquet",
+        "snapshot": data_dir / f"{SNAPSHOT_NAME}.parquet",
+        "processed_csv": data_dir / f"{PROCESSED_NAME}.csv",
+        "probs_csv": data_dir / f"{PROBS_NAME}.csv",
+    }
+    # yarım kalan bir çalışma eski dosyaları bozmasın: geçici dosyalara yazıp sonda yer değiştiriyoruz
+    tmp = {name: path.with_name(path.name + ".tmp") for name, path in paths.items()}
+    writers = {}
+    counts = {"rows": 0, "rescored": 0, "unchanged": 0}
+
+    try:
+        for raw_chunk in read_raw(input_path, chunk_rows):
+            keys = raw_chunk[CUSTOMER_KEY].to_numpy()
+            prints = fingerprints(raw_chunk)
+            changed = np.ones(len(raw_chunk), dtype=bool)
+            if previous is not None:
+                found = previous["index"].get_indexer(keys)
+                known = found >= 0
+                changed[known] = previous["fingerprint"][found[known]] != prints[known]
+                # boş TotalCharges ortalamayla dolduruluyor, ortalama her dışa aktarımda değişebilir
+                changed |= raw_chunk["TotalCharges"].str.strip().eq("").to_numpy()
+
+            parts = []
+            if changed.any():
+                fresh = encode_chunk(raw_chunk[changed], encodings, total_charges_mean)
+                if len(fresh):
+                    fresh["churn_probability"] = model.predict_proba(fresh[FEATURE_COLUMNS])[:, 1]
+                    parts.append(fresh)
+                counts["rescored"] += len(fresh)
+            if not changed.all():
+                kept = old_probs.iloc[previous["position"][found[~changed]]]
+                kept.index = raw_chunk.index[~changed]
+                parts.append(kept)
+                counts["unchanged"] += len(kept)
+            # ham dosyanın sırasına geri dön (encode_chunk tenure=0 satırlarını zaten düşürdü)
+            if not parts:
+                continue
+            merged = pd.concat(parts).sort_index()[parts[0].columns] if len(parts) > 1 else parts[0]
+            merged_prints = pd.Series(prints, index=raw_chunk.index).loc[merged.index].to_numpy()
+
+            probs_chunk = merged.reset_index(drop=True)
+            processed_chunk = probs_chunk.drop(columns=["churn_probability"])
+            if not writers:
+                writers["processed"] = columnar_writer(tmp["processed"], processed_chunk)
+                writers["probs"] = columnar_writer(tmp["probs"], probs_chunk)
+                writers["snapshot"] = snapshot_writer(tmp["snapshot"], state)
+            write_columnar_chunk(writers["processed"], processed_chunk)
+            write_columnar_chunk(writers["probs"], probs_chunk)
+            writers["snapshot"].write_table(pa.Table.from_pydict(
+                {CUSTOMER_KEY: probs_chunk[CUSTOMER_KEY].to_numpy(), "fingerprint": merged_prints},
+                schema=writers["snapshot"].schema))
+            first = counts["rows"] == 0
+            processed_chunk.to_csv(tmp["processed_csv"], mode="w" if first else "a", header=first, index=False)
+            probs_chunk.to_csv(tmp["probs_csv"], mode="w" if first else "a", header=first, index=False)
+            counts["rows"] += len(probs_chunk)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    if counts["rows"]:
+        for name, path in paths.items():
+            tmp[name].replace(path)
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, default=RAW_PATH, help="raw Telco export (.csv)")
+    parser.add_argument("--output-dir", type=Path, default=REFRESH_DIR,
+                        help="folder of the refreshed files and the snapshot (not the preprocess/train outputs)")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--full", action="store_true", help="ignore the snapshot and rescore everyone")
+    args = parser.parse_args(argv)
+
+    counts = refresh(args.input, args.output_dir, args.model, args.chunk_rows, args.full)
+    print(f"{counts['rows']:,} customers: {counts['rescored']:,} new or changed, {counts['unchanged']:,} reused")
+
+
+if __name__ == "__main__":
+    main()
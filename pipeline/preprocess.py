@@ -0,0 +1,158 @@
+"""Streaming preprocess: raw Telco export -> processed customers.
+
+Does what notebooks/preprocess.ipynb does (TotalCharges to numbers with
+blanks filled by the column mean, tenure-0 customers dropped, SeniorCitizen
+as No/Yes, categoricals as integer codes, customerID kept), but reads the
+raw CSV in chunks so peak memory depends on the chunk size only:
+
+- pass 1 streams TotalCharges to get its mean and the number of kept rows;
+- pass 2 encodes each chunk and appends it to the outputs, one Parquet row
+  group per chunk, so nothing but the current chunk is in memory.
+
+The codes do not come from a LabelEncoder fitted on the data (a chunk would
+only see some of the values) but from the fixed schema in app/schema.py.
+They are written to encodings.json next to the outputs; a run whose
+encodings differ from an existing encodings.json stops instead of writing
+codes that no longer match earlier files.
+
+    python -m pipeline.preprocess
+    python -m pipeline.preprocess --input big_raw.csv --output-dir /data/processed --chunk-rows 500000
+"""
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pipeline  # noqa: F401  (app/ modüllerini import yoluna ekliyor)
+from data_store import CUSTOMER_KEY, DATA_DIR, PROCESSED_NAME, columnar_writer, write_columnar_chunk
+from schema import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS
+
+RAW_PATH = Path(__file__).resolve().parent.parent / "data" / "raw" / "Telco-Customer-Churn.csv"
+ENCODINGS_NAME = "encodings.json"
+CHUNK_ROWS = 100_000
+
+# ham dosyada şemadaki etiketten farklı yazılan değerler: ham değer -> şema etiketi
+RAW_ALIASES = {
+    "SeniorCitizen": {"0": "No", "1": "Yes"},
+    "InternetService": {"No": "No Service"},
+}
+
+
+def build_encodings() -> dict:
+    """Raw value -> code for every categorical column, from the schema."""
+    encodings = {}
+    for col, labels in CATEGORICAL_COLUMNS.items():
+        aliases = {label: raw for raw, label in RAW_ALIASES.get(col, {}).items()}
+        encodings[col] = {aliases.get(label, label): code for code, label in enumerate(labels)}
+    return encodings
+
+
+def persist_encodings(encodings, path):
+    """Writes encodings to path, refusing to replace different ones."""
+    path = Path(path)
+    if path.exists():
+        existing = json.loads(path.read_text(encoding="utf-8"))
+        if existing != encodings:
+            raise ValueError(f"{path} holds different encodings; codes would not match earlier outputs "
+                             f"(remove it to re-encode everything)")
+        return
+    path.write_text(json.dumps(encodings, indent=2), encoding="utf-8")
+
+
+def read_raw(path, chunk_rows=CHUNK_ROWS, usecols=None):
+    # her şey metin olarak okunuyor: parça başına tip tahmini parçalar arasında farklı olabilir
+    return pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunk_rows, usecols=usecols)
+
+
+def scan_totals(path, chunk_rows=CHUNK_ROWS):
+    """Pass 1: mean of TotalCharges (as the notebook computes it) and the kept row count."""
+    total, count, kept = 0.0, 0, 0
+    for chunk in read_raw(path, chunk_rows, usecols=["tenure", "TotalCharges"]):
+        charges = pd.to_numeric(chunk["TotalCharges"], errors="coerce")
+        total += charges.sum()
+        count += int(charges.notna().sum())
+        kept += int((pd.to_numeric(chunk["tenure"], errors="coerce").fillna(0) != 0).sum())
+    return (total / count if count else 0.0), kept
+
+
+def encode_chunk(chunk: pd.DataFrame, encodings: dict, total_charges_mean: float) -> pd.DataFrame:
+    """Processed rows of a raw chunk, with the raw column order."""
+    columns = {}
+    for col in chunk.columns:
+        values = chunk[col]
+        if col in encodings:
+            raw_values = list(encodings[col])
+            codes = pd.Categorical(values.str.strip(), categories=raw_values).codes
+            if (codes < 0).any():
+                unknown = sorted(set(values[codes < 0].str.strip()))
+                raise ValueError(f"{col}: values not in the encodings: {unknown[:10]}")
+            # kategori konumundan encodings'teki koda
+            columns[col] = np.asarray([encodings[col][v] for v in raw_values], dtype=np.int8)[codes]
+        elif col in NUMERIC_COLUMNS:
+            columns[col] = pd.to_numeric(values, errors="coerce")
+        else:
+            columns[col] = values
+    df = pd.DataFrame(columns, copy=False)
+
+    df["TotalCharges"] = df["TotalCharges"].fillna(total_charges_mean)
+    df["tenure"] = df["tenure"].fillna(0).astype(np.int64)
+    df["MonthlyCharges"] = df["MonthlyCharges"].astype(np.float64)
+    return df[df["tenure"] != 0]
+
+
+def preprocess(input_path=RAW_PATH, output_dir=DATA_DIR, chunk_rows=CHUNK_ROWS, parquet=True, csv=True) -> int:
+    """Writes PROCESSED_NAME.parquet/.csv and encodings.json to output_dir; returns the row count."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    encodings = build_encodings()
+    persist_encodings(encodings, output_dir / ENCODINGS_NAME)
+
+    total_charges_mean, kept = scan_totals(input_path, chunk_rows)
+
+    # yarım kalan bir çalışma eski çıktıları bozmasın: geçici dosyalara yazıp sonda yer değiştiriyoruz
+    parquet_path = output_dir / f"{PROCESSED_NAME}.parquet"
+    csv_path = output_dir / f"{PROCESSED_NAME}.csv"
+    parquet_tmp = parquet_path.with_suffix(".parquet.tmp")
+    csv_tmp = csv_path.with_suffix(".csv.tmp")
+
+    writer = None
+    rows = 0
+    try:
+        for raw_chunk in read_raw(input_path, chunk_rows):
+            chunk = encode_chunk(raw_chunk, encodings, total_charges_mean)
+            if chunk.empty:
+                continue
+            if parquet:
+                if writer is None:
+                    writer = columnar_writer(parquet_tmp, chunk, kept)
+                write_columnar_chunk(writer, chunk)
+            if csv:
+                chunk.to_csv(csv_tmp, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    if parquet and writer is not None:
+        parquet_tmp.replace(parquet_path)
+    if csv and rows:
+        csv_tmp.replace(csv_path)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, default=RAW_PATH, help="raw Telco export (.csv)")
+    parser.add_argument("--output-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--no-csv", action="store_true", help="only write the Parquet file")
+    args = parser.parse_args(argv)
+
+    rows = preprocess(args.input, args.output_dir, args.chunk_rows, csv=not args.no_csv)
+    print(f"processed {rows:,} customers ({CUSTOMER_KEY} kept as the join key)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Batch scoring: adds churn_probability to the processed customers.
+
+The input is streamed in chunks (Parquet row batches or CSV chunks) and the
+chunks are scored on a process pool. Each worker loads the joblib model
+once, in its initializer, and only the chunk frames travel between
+processes. At most `2 x workers` chunks are in flight, and results are
+appended to the output files in input order as they complete, so memory
+stays bounded by the chunk size whatever the number of customers.
+
+    python -m pipeline.score
+    python -m pipeline.score --input big.parquet --output big_probs.parquet --workers 8
+"""
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import pipeline  # noqa: F401  (app/ modüllerini import yoluna ekliyor)
+from data_store import DATA_DIR, MODEL_PATH, PROBS_NAME, PROCESSED_NAME, columnar_writer, write_columnar_chunk
+from schema import FEATURE_COLUMNS
+
+CHUNK_ROWS = 250_000
+
+_MODEL = None
+
+
+def _init_worker(model_path):
+    """Process pool initializer: loads the model once per worker."""
+    import joblib
+
+    global _MODEL
+    _MODEL = joblib.load(model_path)
+
+
+def score_chunk(chunk: pd.DataFrame):
+    """Churn (class 1) probabilities of the rows of chunk."""
+    return _MODEL.predict_proba(chunk[FEATURE_COLUMNS])[:, 1]
+
+
+def iter_chunks(path, chunk_rows=CHUNK_ROWS):
+    """Yields the input as DataFrames of at most chunk_rows rows."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def count_rows(path):
+    """Row count from the Parquet footer, None for CSV (unknown without a full read)."""
+    path = Path(path)
+    if path.suffix != ".parquet":
+        return None
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def default_input():
+    parquet_path = DATA_DIR / f"{PROCESSED_NAME}.parquet"
+    return parquet_path if parquet_path.exists() else DATA_DIR / f"{PROCESSED_NAME}.csv"
+
+
+def score_file(input_path, output_path=None, csv_path=None, model_path=MODEL_PATH,
+               workers=None, chunk_rows=CHUNK_ROWS):
+    """Scores input_path into output_path (Parquet) and/or csv_path; returns the row count."""
+    workers = workers or os.cpu_count() or 1
+    writer = None
+    rows = 0
+
+    def write(chunk, probabilities):
+        nonlocal writer, rows
+        chunk["churn_probability"] = probabilities
+        if output_path is not None:
+            if writer is None:
+                writer = columnar_writer(output_path, chunk, count_rows(input_path))
+            write_columnar_chunk(writer, chunk)
+        if csv_path is not None:
+            chunk.to_csv(csv_path, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+        rows += len(chunk)
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(str(model_path),)) as pool:
+            pending = deque()
+            for chunk in iter_chunks(input_path, chunk_rows):
+                pending.append((chunk, pool.submit(score_chunk, chunk)))
+                # sırayı koruyup bellekte en fazla 2 x worker parça tutuyoruz
+                if len(pending) >= 2 * workers:
+                    done_chunk, future = pending.popleft()
+                    write(done_chunk, future.result())
+            while pending:
+                done_chunk, future = pending.popleft()
+                write(done_chunk, future.result())
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input", type=Path, default=None, help="processed customers (.parquet or .csv)")
+    parser.add_argument("--output", type=Path, default=DATA_DIR / f"{PROBS_NAME}.parquet",
+                        help="scored Parquet output ('-' to skip)")
+    parser.add_argument("--csv", type=Path, default=DATA_DIR / f"{PROBS_NAME}.csv",
+                        help="scored CSV output ('-' to skip)")
+    parser.add_argument("--model", type=Path, default=MODEL_PATH)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    output_path = None if str(args.output) == "-" else args.output
+    csv_path = None if str(args.csv) == "-" else args.csv
+    rows = score_file(args.input or default_input(), output_path, csv_path, args.model,
+                      args.workers, args.chunk_rows)
+    print(f"scored {rows:,} customers")
+
+
+if __name__ == "__main__":
+    main()
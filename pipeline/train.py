@@ -0,0 +1,266 @@
+"""Model training and selection for the churn model.
+
+Replaces the sequential model comparison of notebooks/train.ipynb:
+
+- every (candidate, hyperparameters, fold) combination from params.yaml is
+  cross-validated on the training split in parallel with joblib;
+- each fold result is cached on disk under a key made of the data hash,
+  the candidate, its parameters and the CV settings, so re-running after a
+  small change of params.yaml only fits the new combinations;
+- XGBoost and CatBoost (optional dependencies) stop early on a slice of the
+  fold's training rows, and the refit uses their mean best iteration;
+- the best configuration by selection_metric is refit on the training
+  split, evaluated on the held-out test split and saved to MODEL_PATH,
+  with its metrics in models/metrics.json. The refit is skipped when the
+  data and the winning configuration did not change.
+
+    python -m pipeline.train
+    python -m pipeline.train --params params.yaml --n-jobs 4
+"""
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import pipeline  # noqa: F401  (app/ modüllerini import yoluna ekliyor)
+from data_store import DATA_DIR, MODEL_PATH, PROCESSED_NAME, read_table
+from schema import FEATURE_COLUMNS, TARGET_COLUMN
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PARAMS_PATH = ROOT_DIR / "params.yaml"
+CACHE_DIR = ROOT_DIR / ".cache" / "train"
+METRICS_PATH = MODEL_PATH.parent / "metrics.json"
+
+# erken durdurmayı destekleyen adaylar ve iterasyon sayısı parametresinin adı
+EARLY_STOPPING = {"xgboost": "n_estimators", "catboost": "iterations"}
+
+
+def load_params(path=PARAMS_PATH) -> dict:
+    import yaml
+
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f)["train"]
+
+
+def load_training_data(data_dir=DATA_DIR):
+    """Features and target of the processed customers."""
+    df = read_table(PROCESSED_NAME, columns=FEATURE_COLUMNS + [TARGET_COLUMN], data_dir=data_dir)
+    if df is None:
+        raise FileNotFoundError(f"{PROCESSED_NAME} not found, run the preprocess stage first")
+    return df[FEATURE_COLUMNS], df[TARGET_COLUMN].to_numpy()
+
+
+def data_hash(X: pd.DataFrame, y) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(np.asarray(y).tobytes())
+    digest.update(",".join(X.columns).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def make_model(name, params, random_state=42, early_stopping_rounds=None):
+    """Unfitted estimator for a candidate; ImportError when its library is missing."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    # SVM ve KNN mesafe tabanlı oldukları için scaler gerekiyor, ağaç modelleri için gerekmiyor
+    if name == "random_forest":
+        return RandomForestClassifier(random_state=random_state, n_jobs=1, **params)
+    if name == "svm":
+        return Pipeline([("scaler", StandardScaler()), ("svm", SVC(random_state=random_state, probability=True, **params))])
+    if name == "knn":
+        return Pipeline([("scaler", StandardScaler()), ("knn", KNeighborsClassifier(**params))])
+    if name == "xgboost":
+        from xgboost import XGBClassifier
+
+        return XGBClassifier(random_state=random_state, n_jobs=1, early_stopping_rounds=early_stopping_rounds, **params)
+    if name == "catboost":
+        from catboost import CatBoostClassifier
+
+        return CatBoostClassifier(random_state=random_state, verbose=False, thread_count=1,
+                                  early_stopping_rounds=early_stopping_rounds, **params)
+    raise ValueError(f"unknown candidate: {name}")
+
+
+def fit_model(name, params, X_train, y_train, settings, early_stop=True):
+    """Fits a candidate; boosted models stop early on a slice of the training rows.
+
+    Returns (model, best_iteration or None).
+    """
+    from sklearn.model_selection import train_test_split
+
+    random_state = settings["random_state"]
+    if early_stop and name in EARLY_STOPPING:
+        X_fit, X_stop, y_fit, y_stop = train_test_split(
+            X_train, y_train, test_size=settings["early_stopping_fraction"],
+            random_state=random_state, stratify=y_train)
+        model = make_model(name, params, random_state, settings["early_stopping_rounds"])
+        if name == "xgboost":
+            model.fit(X_fit, y_fit, eval_set=[(X_stop, y_stop)], verbose=False)
+            return model, int(model.best_iteration) + 1
+        model.fit(X_fit, y_fit, eval_set=(X_stop, y_stop))
+        return model, int(model.get_best_iteration()) + 1
+
+    model = make_model(name, params, random_state)
+    model.fit(X_train, y_train)
+    return model, None
+
+
+def scores(y_true, y_pred) -> dict:
+    from sklearn.metrics import accuracy_score, f1_score, recall_score
+
+    # accuracy yetmez: churn dengesiz, terk edenleri bulmak için recall(1) ve f1(1) önemli
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "f1": float(f1_score(y_true, y_pred, pos_label=1)),
+        "recall": float(recall_score(y_true, y_pred, pos_label=1)),
+    }
+
+
+def evaluate_fold(name, params, X, y, train_idx, val_idx, settings) -> dict:
+    model, best_iteration = fit_model(name, params, X.iloc[train_idx], y[train_idx], settings)
+    result = scores(y[val_idx], model.predict(X.iloc[val_idx]))
+    result["best_iteration"] = best_iteration
+    return result
+
+
+def fold_key(data_key, name, params, fold, settings) -> str:
+    payload = {
+        "data": data_key, "candidate": name, "params": params, "fold": fold,
+        "cv_folds": settings["cv_folds"], "test_size": settings["test_size"], "random_state": settings["random_state"],
+        "early_stopping": [settings["early_stopping_rounds"], settings["early_stopping_fraction"]]
+        if name in EARLY_STOPPING else None,
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def read_cached(key, cache_dir=CACHE_DIR):
+    path = Path(cache_dir) / f"{key}.json"
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+
+def write_cached(key, result, cache_dir=CACHE_DIR):
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache_dir / f"{key}.json").write_text(json.dumps(result), encoding="utf-8")
+
+
+def available_candidates(settings) -> dict:
+    """Candidate grids whose library can be imported (xgboost/catboost are optional)."""
+    from sklearn.model_selection import ParameterGrid
+
+    grids = {}
+    for name, grid in settings["candidates"].items():
+        try:
+            make_model(name, {})
+        except ImportError:
+            print(f"skipping {name}: library not installed")
+            continue
+        grids[name] = list(ParameterGrid({k: v if isinstance(v, list) else [v] for k, v in grid.items()}))
+    return grids
+
+
+def cross_validate(X, y, settings, n_jobs=-1, cache_dir=CACHE_DIR) -> list:
+    """Mean CV scores of every (candidate, params), fitting only the uncached folds in parallel."""
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import StratifiedKFold
+
+    folds = list(StratifiedKFold(n_splits=settings["cv_folds"], shuffle=True,
+                                 random_state=settings["random_state"]).split(X, y))
+    data_key = data_hash(X, y)
+
+    configs = [(name, params) for name, grid in available_candidates(settings).items() for params in grid]
+    tasks, results = [], {}
+    for name, params in configs:
+        for fold in range(len(folds)):
+            key = fold_key(data_key, name, params, fold, settings)
+            cached = read_cached(key, cache_dir)
+            if cached is None:
+                tasks.append((key, name, params, fold))
+            else:
+                results[key] = cached
+
+    print(f"{len(configs)} configurations x {len(folds)} folds: "
+          f"{len(results)} cached, {len(tasks)} to fit")
+    fitted = Parallel(n_jobs=n_jobs)(
+        delayed(evaluate_fold)(name, params, X, y, *folds[fold], settings) for _, name, params, fold in tasks)
+    for (key, *_), result in zip(tasks, fitted):
+        write_cached(key, result, cache_dir)
+        results[key] = result
+
+    summary = []
+    for name, params in configs:
+        fold_results = [results[fold_key(data_key, name, params, fold, settings)] for fold in range(len(folds))]
+        row = {"candidate": name, "params": params}
+        for metric in ("accuracy", "f1", "recall"):
+            row[metric] = float(np.mean([r[metric] for r in fold_results]))
+        iterations = [r["best_iteration"] for r in fold_results if r["best_iteration"]]
+        row["best_iteration"] = int(np.mean(iterations)) if iterations else None
+        summary.append(row)
+    return summary
+
+
+def final_params(best) -> dict:
+    """Winning parameters, with the CV mean best iteration for early-stopped models."""
+    params = dict(best["params"])
+    if best["best_iteration"] and best["candidate"] in EARLY_STOPPING:
+        params[EARLY_STOPPING[best["candidate"]]] = best["best_iteration"]
+    return params
+
+
+def train(params_path=PARAMS_PATH, n_jobs=-1, cache_dir=CACHE_DIR, model_path=MODEL_PATH,
+          metrics_path=METRICS_PATH) -> dict:
+    import joblib
+    from sklearn.model_selection import train_test_split
+
+    settings = load_params(params_path)
+    X, y = load_training_data()
+
+    # stratify: churn oranı az olduğu için eğitim ve test setinde oran eşit kalsın
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=settings["test_size"], random_state=settings["random_state"], stratify=y)
+
+    summary = cross_validate(X_train, y_train, settings, n_jobs, cache_dir)
+    best = max(summary, key=lambda row: row[settings["selection_metric"]])
+    params = final_params(best)
+    model_key = fold_key(data_hash(X, y), best["candidate"], params, "final", settings)
+
+    previous = json.loads(Path(metrics_path).read_text(encoding="utf-8")) if Path(metrics_path).exists() else {}
+    if previous.get("model_key") == model_key and Path(model_path).exists():
+        print(f"best model unchanged ({best['candidate']}), keeping {model_path}")
+        return previous
+
+    model, _ = fit_model(best["candidate"], params, X_train, y_train, settings, early_stop=False)
+    Path(model_path).parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(model, model_path)
+
+    metrics = {
+        "model_key": model_key,
+        "candidate": best["candidate"],
+        "params": params,
+        "cv": {metric: best[metric] for metric in ("accuracy", "f1", "recall")},
+        "test": scores(y_test, model.predict(X_test)),
+        "leaderboard": sorted(summary, key=lambda row: -row[settings["selection_metric"]]),
+    }
+    Path(metrics_path).write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    print(f"best model: {best['candidate']} {params} -> {model_path} (test f1 {metrics['test']['f1']:.4f})")
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--params", type=Path, default=PARAMS_PATH)
+    parser.add_argument("--n-jobs", type=int, default=-1, help="parallel fold fits (default: all cores)")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR)
+    args = parser.parse_args(argv)
+    train(args.params, args.n_jobs, args.cache_dir)
+
+
+if __name__ == "__main__":
+    main()